@@ -48,10 +48,15 @@ class Settings(BaseSettings):
     
     # Google Gemini LLM Configuration
     gemini_model: str = "gemini-2.0-flash"  # Gemini model for translation
+    gemini_max_concurrency: int = 32  # Max Gemini requests in flight per process
     
     # Translation Configuration
     default_source_language: str = "en"
     default_target_language: str = "es"
+    translation_cache_size: int = 10000  # Max in-memory cached translations (0 disables)
+    translation_cache_db: Optional[str] = "translation_cache.db"  # SQLite translation cache (empty disables)
+    translation_cache_ttl_hours: float = 72.0
+    translation_verbose_display: bool = False  # Echo every translation to the terminal
     
     class Config:
         env_file = ".env"
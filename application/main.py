@@ -27,7 +27,8 @@ from service.stt import get_stt_service, initialize_stt_service
 from service.tts import get_tts_service, initialize_tts_service
 from service.tts_queue import get_tts_queue, initialize_tts_queue
 
-# Logger
+# Logger (configured here rather than by the service modules)
+logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Request models
@@ -46,6 +47,7 @@ class StreamingTranslationRequest(BaseModel):
     mime_type: Optional[str] = None
     batch_size: int = 1
     delay_ms: int = 100
+    concurrency: int = 4
 
 class LanguageDetectionRequest(BaseModel):
     text: str
@@ -107,6 +109,7 @@ async def lifespan(app: FastAPI):
         
         # Initialize translation service
         if initialize_translation_service():
+            get_translation_service().start_warm_up()
             print("✅ Translation service initialized successfully")
         else:
             print("⚠️ Translation service initialization failed")
@@ -371,7 +374,8 @@ async def translate_stream(request: StreamingTranslationRequest):
                 model=request.model,
                 mime_type=request.mime_type,
                 batch_size=request.batch_size,
-                delay_ms=request.delay_ms
+                delay_ms=request.delay_ms,
+                concurrency=request.concurrency
             ):
                 yield f"data: {json.dumps(result)}\n\n"
         
@@ -389,6 +393,42 @@ async def translate_stream(request: StreamingTranslationRequest):
             detail=f"Streaming translation failed: {str(e)}"
         )
 
+@app.post("/translate/incremental")
+async def translate_incremental(request: TranslationRequest):
+    """Translate a single text string, streaming the translation as it is generated"""
+    translation_service = get_translation_service()
+    
+    if not translation_service.is_initialized:
+        raise HTTPException(
+            status_code=503,
+            detail="Translation service not initialized"
+        )
+    
+    # Validate text is not empty
+    if not request.text or not request.text.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Text cannot be empty"
+        )
+    
+    async def generate_pieces():
+        try:
+            async for piece in translation_service.translate_text_stream(
+                text=request.text,
+                source_language=request.source_language,
+                target_language=request.target_language
+            ):
+                yield f"data: {json.dumps({'delta': piece})}\n\n"
+            yield f"data: {json.dumps({'done': True})}\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+    
+    return StreamingResponse(
+        generate_pieces(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Connection": "keep-alive"}
+    )
+
 @app.get("/translate/languages", response_model=Dict[str, Any])
 async def get_supported_languages(target_language: str = "en"):
     """Get list of supported languages for translation"""
@@ -401,16 +441,21 @@ async def get_supported_languages(target_language: str = "en"):
                 detail="Translation service not initialized"
             )
         
-        languages = translation_service.get_supported_languages(target_language)
+        languages = translation_service.get_supported_languages()
         
-        return {
-            "status": "success",
-            "timestamp": datetime.utcnow().isoformat(),
-            "data": {
-                "languages": languages,
-                "count": len(languages)
-            }
-        }
+        # The list is fixed for the lifetime of the deployment, so clients may
+        # cache the response
+        return JSONResponse(
+            content={
+                "status": "success",
+                "timestamp": datetime.utcnow().isoformat(),
+                "data": {
+                    "languages": [dict(language) for language in languages],
+                    "count": len(languages)
+                }
+            },
+            headers={"Cache-Control": "public, max-age=86400"}
+        )
         
     except HTTPException:
         raise
@@ -439,7 +484,7 @@ async def detect_language(request: LanguageDetectionRequest):
                 detail="Text cannot be empty"
             )
         
-        result = translation_service.detect_language(request.text)
+        result = await translation_service.detect_language(request.text)
         
         return {
             "status": "success",
@@ -474,6 +519,27 @@ async def get_translation_status():
             detail=f"Failed to get translation status: {str(e)}"
         )
 
+@app.get("/translate/health", response_model=Dict[str, Any])
+async def translation_health_check():
+    """Readiness probe: verify Gemini connectivity with a live request"""
+    translation_service = get_translation_service()
+    if not translation_service.is_initialized:
+        raise HTTPException(
+            status_code=503,
+            detail="Translation service not initialized"
+        )
+    
+    if not await translation_service.healthcheck():
+        raise HTTPException(
+            status_code=503,
+            detail="Translation service cannot reach Google Gemini"
+        )
+    
+    return {
+        "status": "healthy",
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 @app.post("/translate/reset-stats")
 async def reset_translation_statistics():
     """Reset translation service statistics"""
@@ -493,6 +559,25 @@ async def reset_translation_statistics():
             detail=f"Failed to reset statistics: {str(e)}"
         )
 
+@app.post("/translate/clear-cache")
+async def clear_translation_cache():
+    """Clear cached translations (memory and disk)"""
+    try:
+        translation_service = get_translation_service()
+        await translation_service.clear_cache()
+        
+        return {
+            "status": "success",
+            "message": "Translation cache cleared",
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to clear translation cache: {str(e)}"
+        )
+
 # STT endpoints
 @app.post("/stt/transcribe-file", response_model=Dict[str, Any])
 async def transcribe_audio_file(request: STTFileRequest):
@@ -772,7 +857,7 @@ async def text_to_speech_speak(request: TTSRequest):
         
         if request.play_audio:
             # Convert text to speech and play it
-            tts_service.speak(request.text, cleanup=request.cleanup)
+            await asyncio.to_thread(tts_service.speak, request.text, cleanup=request.cleanup)
             
             return {
                 "status": "success",
@@ -787,7 +872,7 @@ async def text_to_speech_speak(request: TTSRequest):
             }
         else:
             # Just convert to audio file without playing
-            audio_file = tts_service.text_to_speech(request.text)
+            audio_file = await tts_service.text_to_speech_async(request.text)
             
             return {
                 "status": "success",
@@ -829,7 +914,7 @@ async def text_to_speech_file(request: TTSFileRequest):
             tts_service.set_voice_gender(request.voice_gender)
         
         # Convert text to speech file
-        audio_file = tts_service.text_to_speech(request.text, filename=request.filename)
+        audio_file = await tts_service.text_to_speech_async(request.text, filename=request.filename)
         
         return {
             "status": "success",
@@ -939,7 +1024,7 @@ async def text_to_speech_dual_speakers(request: TTSRequest):
             tts_service.set_voice_gender(request.voice_gender)
         
         # Generate audio file
-        audio_file = tts_service.text_to_speech(request.text)
+        audio_file = await tts_service.text_to_speech_async(request.text)
         
         # Convert MP3 to WAV for aplay compatibility
         wav_file = audio_file.replace('.mp3', '.wav')
@@ -956,7 +1041,8 @@ async def text_to_speech_dual_speakers(request: TTSRequest):
             # Clean up files if requested
             if request.cleanup:
                 try:
-                    os.remove(audio_file)
+                    if not tts_service.is_cached_audio(audio_file):
+                        os.remove(audio_file)
                     os.remove(wav_file)
                 except OSError as e:
                     logger.warning(f"Could not clean up temporary files: {e}")
@@ -986,7 +1072,7 @@ async def text_to_speech_dual_speakers(request: TTSRequest):
             logger.warning(f"ffmpeg conversion failed: {e}, trying direct playback")
             audio_service._start_dual_playback(audio_file, audio_file)
             
-            if request.cleanup:
+            if request.cleanup and not tts_service.is_cached_audio(audio_file):
                 try:
                     os.remove(audio_file)
                 except OSError as e:
@@ -3,18 +3,19 @@ Speech-to-Text Service using Google Speech-to-Text API
 Provides real-time speech recognition with streaming capabilities
 """
 
+import atexit
 import os
-import sys
 import time
 import threading
 import queue
 import asyncio
-from typing import Generator, Optional, Dict, Any, List, AsyncGenerator
-import json
-import base64
-import io
-import wave
-from datetime import datetime
+import collections
+from collections import namedtuple
+from typing import Generator, Optional, Dict, Any, List, AsyncGenerator, Tuple
+import logging
+from datetime import datetime, timedelta
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 # Google Cloud Speech-to-Text
 from google.cloud import speech
@@ -30,6 +31,138 @@ import numpy as np
 # Performance monitoring
 import psutil
 
+logger = logging.getLogger(__name__)
+
+# How long an enumerated input-device list stays valid (seconds)
+DEVICE_CACHE_TTL = 5.0
+
+# Poll interval of the recognition thread when no captured audio is pending
+AUDIO_POLL_INTERVAL = 0.01
+
+# File transcription: audio longer than the target is split at pauses and the
+# pieces are recognized concurrently. Synchronous recognize() accepts at most
+# one minute of audio per request.
+SEGMENT_TARGET_SECONDS = 15.0
+SEGMENT_MAX_SECONDS = 55.0
+SILENCE_THRESHOLD = 583  # ~-35 dBFS mean absolute amplitude for int16 PCM
+MAX_RECOGNIZE_WORKERS = 8
+
+@lru_cache(maxsize=32)
+def _recognition_config(sample_rate: int, language_code: str) -> speech.RecognitionConfig:
+    """Recognition settings for uploaded and websocket audio; fixed per rate and language."""
+    return speech.RecognitionConfig(
+        encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+        sample_rate_hertz=sample_rate,
+        language_code=language_code,
+        enable_automatic_punctuation=True,
+        model="latest_long",
+        use_enhanced=True,
+    )
+
+
+@lru_cache(maxsize=32)
+def _streaming_config(sample_rate: int, language_code: str) -> speech.StreamingRecognitionConfig:
+    """Streaming wrapper around _recognition_config with interim results enabled."""
+    return speech.StreamingRecognitionConfig(
+        config=_recognition_config(sample_rate, language_code),
+        interim_results=True,
+        single_utterance=False,
+    )
+
+
+# Underlying protobuf class of speech.RecognizeRequest
+_RecognizeRequestPb = speech.RecognizeRequest.pb()
+
+# Clips shorter or quieter than this are answered locally without a request
+MIN_AUDIO_SECONDS = 0.2
+MIN_AUDIO_RMS = 0.005  # Fraction of int16 full scale
+
+# Wall-clock anchor for result timestamps; later stamps are derived from the
+# monotonic clock instead of building a fresh utcnow() per result.
+_BASE_UTC = datetime.utcnow()
+_BASE_MONOTONIC = time.monotonic()
+
+
+def _utc_timestamp() -> str:
+    """Return the current UTC time as an ISO-8601 string."""
+    return (_BASE_UTC + timedelta(seconds=time.monotonic() - _BASE_MONOTONIC)).isoformat()
+
+
+# Credential locations that do not depend on the caller, resolved once
+_ROOT_CREDENTIALS = os.path.join(os.path.dirname(os.path.dirname(__file__)), "credentials.json")
+_BROADCAST_CREDENTIALS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "credentials.json"
+)
+
+
+@lru_cache(maxsize=4)
+def _load_credentials(path: str, mtime: float) -> service_account.Credentials:
+    """Parse a service-account file; keyed on mtime so edits are picked up."""
+    return service_account.Credentials.from_service_account_file(
+        path,
+        scopes=['https://www.googleapis.com/auth/cloud-platform']
+    )
+
+
+@lru_cache(maxsize=4)
+def _get_speech_client(path: Optional[str], mtime: float) -> speech.SpeechClient:
+    """Return a SpeechClient per credentials file so its gRPC channel is reused."""
+    if path is None:
+        return speech.SpeechClient()
+    return speech.SpeechClient(credentials=_load_credentials(path, mtime))
+
+
+# Snapshot returned by STTService.get_statistics. uptime_seconds and
+# chunks_per_second are None until streaming starts; cpu_percent and
+# memory_percent are None when monitoring is disabled.
+STTStats = namedtuple("STTStats", [
+    "is_initialized", "is_streaming", "processed_chunks", "total_transcripts",
+    "error_count", "last_error", "average_confidence",
+    "uptime_seconds", "chunks_per_second", "cpu_percent", "memory_percent",
+])
+
+
+# PortAudio host handle shared by every STTService in the process. Creating a
+# PyAudio instance re-initialises PortAudio and enumerates all devices.
+_PA_LOCK = threading.Lock()
+_PA_REFCOUNT = 0
+_PA_INSTANCE = None
+
+
+def acquire_pa():
+    """Return the shared PyAudio instance, creating it on first use."""
+    global _PA_INSTANCE, _PA_REFCOUNT
+    with _PA_LOCK:
+        if _PA_INSTANCE is None:
+            _PA_INSTANCE = pyaudio.PyAudio()
+        _PA_REFCOUNT += 1
+        return _PA_INSTANCE
+
+
+def release_pa():
+    """Drop one reference to the shared PyAudio instance."""
+    global _PA_INSTANCE, _PA_REFCOUNT
+    with _PA_LOCK:
+        if _PA_REFCOUNT == 0:
+            return
+        _PA_REFCOUNT -= 1
+        if _PA_REFCOUNT == 0 and _PA_INSTANCE is not None:
+            _PA_INSTANCE.terminate()
+            _PA_INSTANCE = None
+
+
+def _shutdown_pa():
+    """Terminate PortAudio at interpreter exit regardless of outstanding references."""
+    global _PA_INSTANCE, _PA_REFCOUNT
+    with _PA_LOCK:
+        if _PA_INSTANCE is not None:
+            _PA_INSTANCE.terminate()
+            _PA_INSTANCE = None
+        _PA_REFCOUNT = 0
+
+
+atexit.register(_shutdown_pa)
+
 
 class STTService:
     """High-performance speech-to-text service with streaming capabilities."""
@@ -64,17 +197,23 @@ class STTService:
         self.audio_format = pyaudio.paInt16
         self.channels = 1  # Mono audio for better performance
         self.input_device_index = None  # Use default input device if None
+        self._last_callback_status = 0  # Last non-zero PortAudio callback status flags
+        self._devices_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
         
         # Initialize Google Speech client
         self._init_speech_client(credentials_path)
         
         # Audio streaming
-        self.audio = pyaudio.PyAudio()
+        self.audio = acquire_pa()
         self.stream = None
         self.is_streaming = False
         
         # Threading for performance - increased queue sizes for better buffering
-        self.audio_queue = queue.Queue(maxsize=100)  # Increased from 10 to 100
+        # Captured audio is handed from the PortAudio callback to the recognition
+        # thread through a bounded deque: append/popleft are atomic, so the
+        # real-time callback never blocks on a lock, and the oldest chunks are
+        # dropped automatically when the consumer falls behind.
+        self.audio_queue = collections.deque(maxlen=100)
         self.result_queue = queue.Queue(maxsize=200)  # Increased from 50 to 200
         
         # Performance metrics
@@ -82,6 +221,7 @@ class STTService:
         self.processed_chunks = 0
         self.total_transcripts = 0
         self.total_confidence = 0.0
+        self._stats_lock = threading.Lock()  # Keeps the transcript count/confidence sum pair consistent
         
         # Debouncing for results
         self.last_result_time = 0
@@ -100,48 +240,54 @@ class STTService:
         self.error_count = 0
         self.last_error = None
         
+        # System metrics are sampled off the request path; get_statistics
+        # only reads the latest values.
+        self._cpu_percent = 0.0
+        self._memory_percent = 0.0
+        self._monitor_stop = threading.Event()
+        if self.enable_monitoring:
+            threading.Thread(target=self._monitor_loop, daemon=True).start()
+        
+    def _monitor_loop(self):
+        """Refresh cached CPU and memory usage until monitoring is stopped."""
+        while not self._monitor_stop.is_set():
+            try:
+                self._cpu_percent = psutil.cpu_percent(interval=1.0)
+                self._memory_percent = psutil.virtual_memory().percent
+            except Exception as e:
+                logger.warning(f"⚠️ System monitor error: {e}")
+                self._monitor_stop.wait(5.0)
+    
     def _init_speech_client(self, credentials_path: Optional[str]):
         """Initialize Google Speech-to-Text client with credentials."""
         try:
-            # Check for credentials in multiple locations
-            possible_paths = []
-            
-            if credentials_path and os.path.exists(credentials_path):
-                possible_paths.append(credentials_path)
-            
-            # Check for credentials.json in root folder
-            root_credentials = os.path.join(os.path.dirname(os.path.dirname(__file__)), "credentials.json")
-            if os.path.exists(root_credentials):
-                possible_paths.append(root_credentials)
-            
-            # Check for credentials.json in multi-lang-broadcast folder
-            broadcast_credentials = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "credentials.json")
-            if os.path.exists(broadcast_credentials):
-                possible_paths.append(broadcast_credentials)
-            
-            # Check environment variable
-            env_credentials = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-            if env_credentials and os.path.exists(env_credentials):
-                possible_paths.append(env_credentials)
+            # Check for credentials in multiple locations: explicit path,
+            # root folder, multi-lang-broadcast folder, environment variable
+            candidates = (
+                credentials_path,
+                _ROOT_CREDENTIALS,
+                _BROADCAST_CREDENTIALS,
+                os.getenv("GOOGLE_APPLICATION_CREDENTIALS"),
+            )
+            credentials_file = next(
+                (path for path in candidates if path and os.path.exists(path)), None
+            )
             
             # Use the first valid credentials file found
-            if possible_paths:
-                credentials_file = possible_paths[0]
-                print(f"✓ Using credentials file: {credentials_file}")
-                credentials = service_account.Credentials.from_service_account_file(
-                    credentials_file,
-                    scopes=['https://www.googleapis.com/auth/cloud-platform']
+            if credentials_file:
+                logger.info(f"✓ Using credentials file: {credentials_file}")
+                self.speech_client = _get_speech_client(
+                    credentials_file, os.path.getmtime(credentials_file)
                 )
-                self.speech_client = speech.SpeechClient(credentials=credentials)
             else:
                 # Try to use default credentials (ADC - Application Default Credentials)
-                print("✓ Using Application Default Credentials")
-                self.speech_client = speech.SpeechClient()
+                logger.info("✓ Using Application Default Credentials")
+                self.speech_client = _get_speech_client(None, 0.0)
             
-            print("✓ Google Speech-to-Text client initialized")
+            logger.info("✓ Google Speech-to-Text client initialized")
             
         except Exception as e:
-            print(f"✗ Failed to initialize Google Speech client: {e}")
+            logger.error(f"✗ Failed to initialize Google Speech client: {e}")
             self.is_initialized = False
             self.last_error = str(e)
             raise
@@ -149,26 +295,10 @@ class STTService:
     def _audio_callback(self, in_data, frame_count, time_info, status):
         """Audio callback for real-time streaming."""
         if self.is_streaming:
-            try:
-                # Try to put audio data with timeout to prevent blocking
-                self.audio_queue.put_nowait(in_data)
-                # Debug: print when we receive audio data
-                if self.processed_chunks % 100 == 0:  # Print every 100 chunks
-                    print(f"🎤 Audio callback: received {len(in_data)} bytes, chunk {self.processed_chunks}")
-            except queue.Full:
-                # Clear some old audio data to make room for new data
-                try:
-                    # Remove up to 5 old chunks to make room
-                    for _ in range(min(5, self.audio_queue.qsize())):
-                        self.audio_queue.get_nowait()
-                    self.audio_queue.put_nowait(in_data)
-                    print(f"⚠️ Audio queue full, cleared old chunks to make room")
-                except queue.Empty:
-                    # If queue is empty, just put the new data
-                    try:
-                        self.audio_queue.put_nowait(in_data)
-                    except queue.Full:
-                        print(f"⚠️ Audio queue still full, dropping audio chunk")
+            self.audio_queue.append(in_data)
+        if status:
+            # Reported from the recognition thread; no I/O on the audio thread
+            self._last_callback_status = status
         return (None, pyaudio.paContinue)
     
     def _process_audio_stream(self, language_code: str = None):
@@ -176,34 +306,29 @@ class STTService:
         def audio_generator() -> Generator[bytes, None, None]:
             """Generate audio chunks for streaming recognition."""
             consecutive_empty_count = 0
-            max_consecutive_empty = 100  # Allow up to 10 seconds of no audio before giving up
+            max_consecutive_empty = int(5.0 / AUDIO_POLL_INTERVAL)  # Warn after 5 seconds of no audio
             
             while self.is_streaming:
                 try:
-                    # Get audio chunk with shorter timeout for more responsive processing
-                    chunk = self.audio_queue.get(timeout=0.05)  # Reduced from 0.1 to 0.05
-                    yield chunk
-                    self.processed_chunks += 1
-                    consecutive_empty_count = 0  # Reset counter on successful chunk
-                    
-                    # Debug: print when we process audio chunks
-                    if self.processed_chunks % 50 == 0:  # Print every 50 chunks
-                        print(f"🔄 Processing audio chunk {self.processed_chunks}, size: {len(chunk)} bytes")
-                        
-                except queue.Empty:
+                    chunk = self.audio_queue.popleft()
+                except IndexError:
                     consecutive_empty_count += 1
                     if consecutive_empty_count > max_consecutive_empty:
-                        print(f"⚠️ No audio data for {max_consecutive_empty * 0.05} seconds, checking if streaming should continue")
-                        # Check if we should continue or if there's an issue
-                        if not self.is_streaming:
-                            break
+                        logger.warning(f"⚠️ No audio data for {max_consecutive_empty * AUDIO_POLL_INTERVAL} seconds, checking if streaming should continue")
                         consecutive_empty_count = 0  # Reset to continue checking
+                    time.sleep(AUDIO_POLL_INTERVAL)
                     continue
-                except Exception as e:
-                    print(f"Audio processing error: {e}")
-                    self.error_count += 1
-                    self.last_error = str(e)
-                    break
+                
+                yield chunk
+                self.processed_chunks += 1
+                consecutive_empty_count = 0  # Reset counter on successful chunk
+                
+                if self._last_callback_status:
+                    logger.warning(f"⚠️ Audio callback status: {self._last_callback_status}")
+                    self._last_callback_status = 0
+                
+                if self.processed_chunks % 50 == 0:  # Log every 50 chunks
+                    logger.debug("🔄 Processing audio chunk %d, size: %d bytes", self.processed_chunks, len(chunk))
         
         # Configure streaming recognition with improved settings
         config = speech.RecognitionConfig(
@@ -267,18 +392,16 @@ class STTService:
                             try:
                                 self.result_queue.put_nowait(("FINAL", clean_transcript, confidence))
                                 self.last_final_transcript = clean_transcript
-                                self.total_transcripts += 1
-                                self.total_confidence += confidence if confidence else 0
-                                print(f"📝 Final result queued: '{clean_transcript}'")
+                                self._record_transcript(confidence)
+                                logger.debug("📝 Final result queued: %r", clean_transcript)
                             except queue.Full:
                                 # Clear old results if queue is full to prevent memory buildup
                                 try:
                                     self.result_queue.get_nowait()
                                     self.result_queue.put_nowait(("FINAL", clean_transcript, confidence))
                                     self.last_final_transcript = clean_transcript
-                                    self.total_transcripts += 1
-                                    self.total_confidence += confidence if confidence else 0
-                                    print(f"📝 Final result queued (after clearing old): '{clean_transcript}'")
+                                    self._record_transcript(confidence)
+                                    logger.debug("📝 Final result queued (after clearing old): %r", clean_transcript)
                                 except queue.Empty:
                                     pass
                         else:
@@ -289,10 +412,10 @@ class STTService:
                             try:
                                 self.result_queue.put_nowait(("INTERIM", clean_transcript, confidence))
                                 self.last_interim_transcript = clean_transcript
-                                print(f"📝 Interim result queued: '{clean_transcript}'")
+                                logger.debug("📝 Interim result queued: %r", clean_transcript)
                             except queue.Full:
                                 # For interim results, just skip if queue is full
-                                print(f"⚠️ Result queue full, skipping interim result: '{clean_transcript}'")
+                                logger.warning("⚠️ Result queue full, skipping interim result: %r", clean_transcript)
                                 pass
                     
                     # If we get here, the streaming completed successfully
@@ -300,19 +423,19 @@ class STTService:
                     
                 except Exception as e:
                     retry_count += 1
-                    print(f"Streaming recognition error (attempt {retry_count}/{max_retries}): {e}")
+                    logger.error(f"Streaming recognition error (attempt {retry_count}/{max_retries}): {e}")
                     self.error_count += 1
                     self.last_error = str(e)
                     
                     if retry_count < max_retries:
-                        print(f"Retrying streaming recognition in 1 second...")
+                        logger.info("Retrying streaming recognition in 1 second...")
                         time.sleep(1)
                     else:
-                        print(f"Max retries reached, giving up on streaming recognition")
+                        logger.error("Max retries reached, giving up on streaming recognition")
                         break
                     
         except Exception as e:
-            print(f"Streaming recognition setup error: {e}")
+            logger.error(f"Streaming recognition setup error: {e}")
             self.error_count += 1
             self.last_error = str(e)
     
@@ -321,8 +444,8 @@ class STTService:
         if not self.is_initialized:
             raise Exception("STT service not initialized")
         
-        print(f"🚀 Starting Speech-to-Text streaming for language: {language_code}")
-        print(f"🎤 Audio format: {self.audio_format}, Sample rate: {self.sample_rate}, Channels: {self.channels}")
+        logger.info(f"🚀 Starting Speech-to-Text streaming for language: {language_code}")
+        logger.info(f"🎤 Audio format: {self.audio_format}, Sample rate: {self.sample_rate}, Channels: {self.channels}")
         
         # Initialize audio stream
         try:
@@ -339,12 +462,12 @@ class STTService:
             # Add input_device_index if specified
             if self.input_device_index is not None:
                 stream_params['input_device_index'] = self.input_device_index
-                print(f"✅ Using input device index: {self.input_device_index}")
+                logger.info(f"✅ Using input device index: {self.input_device_index}")
             
             self.stream = self.audio.open(**stream_params)
-            print("✅ Audio stream initialized successfully")
+            logger.info("✅ Audio stream initialized successfully")
         except Exception as e:
-            print(f"❌ Failed to initialize audio stream: {e}")
+            logger.error(f"❌ Failed to initialize audio stream: {e}")
             raise
         
         self.is_streaming = True
@@ -359,9 +482,9 @@ class STTService:
         # Start audio stream
         try:
             self.stream.start_stream()
-            print("✅ Audio stream started successfully")
+            logger.info("✅ Audio stream started successfully")
         except Exception as e:
-            print(f"❌ Failed to start audio stream: {e}")
+            logger.error(f"❌ Failed to start audio stream: {e}")
             raise
         
         # Start processing thread
@@ -374,12 +497,12 @@ class STTService:
         
         try:
             # Yield results as they come in
-            print("🔄 Starting main transcription loop...")
+            logger.info("🔄 Starting main transcription loop...")
             loop_count = 0
             while self.is_streaming:
                 try:
                     result_type, transcript, confidence = self.result_queue.get(timeout=0.1)
-                    print(f"📝 Received result: {result_type} - '{transcript}' (confidence: {confidence})")
+                    logger.debug("📝 Received result: %s - %r (confidence: %s)", result_type, transcript, confidence)
                     
                     # Apply debouncing to prevent rapid-fire updates
                     current_time = time.time()
@@ -392,16 +515,16 @@ class STTService:
                     if result_type == "FINAL":
                         # Skip if this is the same final result we just processed
                         if clean_transcript == self.last_final_transcript or not clean_transcript:
-                            print(f"⏭️ Skipping duplicate final result: '{clean_transcript}'")
+                            logger.debug("⏭️ Skipping duplicate final result: %r", clean_transcript)
                             continue
                         
-                        print(f"🎯 Final transcript: '{clean_transcript}' - YIELDING TO CLIENT")
+                        logger.debug("🎯 Final transcript: %r", clean_transcript)
                         self.last_final_transcript = clean_transcript
                         yield {
                             "type": "final",
                             "transcript": clean_transcript,
                             "confidence": confidence,
-                            "timestamp": datetime.utcnow().isoformat(),
+                            "timestamp": _utc_timestamp(),
                             "language": language_code or self.language_code
                         }
                         self.last_result_time = current_time
@@ -409,16 +532,16 @@ class STTService:
                     elif result_type == "INTERIM":
                         # Skip only if empty, allow interim results to flow through
                         if not clean_transcript:
-                            print(f"⏭️ Skipping empty interim result")
+                            logger.debug("⏭️ Skipping empty interim result")
                             continue
                         
-                        print(f"⏳ Interim transcript: '{clean_transcript}' - YIELDING TO CLIENT")
+                        logger.debug("⏳ Interim transcript: %r", clean_transcript)
                         self.last_interim_transcript = clean_transcript
                         yield {
                             "type": "interim",
                             "transcript": clean_transcript,
                             "confidence": confidence,
-                            "timestamp": datetime.utcnow().isoformat(),
+                            "timestamp": _utc_timestamp(),
                             "language": language_code or self.language_code
                         }
                         self.last_result_time = current_time
@@ -429,22 +552,22 @@ class STTService:
                     
                     # Send heartbeat if no results for a while
                     if current_time - self.last_heartbeat > self.heartbeat_interval:
-                        print(f"💓 Sending heartbeat to keep connection alive")
+                        logger.debug("💓 Sending heartbeat to keep connection alive")
                         yield {
                             "type": "heartbeat",
                             "message": "Streaming active",
-                            "timestamp": datetime.utcnow().isoformat(),
+                            "timestamp": _utc_timestamp(),
                             "processed_chunks": self.processed_chunks,
-                            "queue_size": self.audio_queue.qsize()
+                            "queue_size": len(self.audio_queue)
                         }
                         self.last_heartbeat = current_time
                     
                     if loop_count % 100 == 0:  # Print every 100 loops (10 seconds)
-                        print(f"⏳ Waiting for audio results... (loop {loop_count})")
+                        logger.debug("⏳ Waiting for audio results... (loop %d)", loop_count)
                     await asyncio.sleep(0.01)  # Small delay to prevent busy waiting
                     continue
                 except Exception as e:
-                    print(f"Display error: {e}")
+                    logger.error(f"Display error: {e}")
                     self.error_count += 1
                     self.last_error = str(e)
                     break
@@ -459,20 +582,7 @@ class STTService:
         
         try:
             # Configure streaming recognition
-            config = speech.RecognitionConfig(
-                encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                sample_rate_hertz=self.sample_rate,
-                language_code=language_code or self.language_code,
-                enable_automatic_punctuation=True,
-                model="latest_long",
-                use_enhanced=True,
-            )
-            
-            streaming_config = speech.StreamingRecognitionConfig(
-                config=config,
-                interim_results=True,
-                single_utterance=False,
-            )
+            streaming_config = _streaming_config(self.sample_rate, language_code or self.language_code)
             
             # Create audio request
             audio_request = speech.StreamingRecognizeRequest(audio_content=audio_data)
@@ -503,31 +613,30 @@ class STTService:
                             "type": "final",
                             "transcript": clean_transcript,
                             "confidence": confidence,
-                            "timestamp": datetime.utcnow().isoformat(),
+                            "timestamp": _utc_timestamp(),
                             "language": language_code or self.language_code
                         }
                         self.last_final_transcript = clean_transcript
-                        self.total_transcripts += 1
-                        self.total_confidence += confidence if confidence else 0
+                        self._record_transcript(confidence)
                 else:
                     if clean_transcript and clean_transcript != self.last_interim_transcript:
                         yield {
                             "type": "interim",
                             "transcript": clean_transcript,
                             "confidence": confidence,
-                            "timestamp": datetime.utcnow().isoformat(),
+                            "timestamp": _utc_timestamp(),
                             "language": language_code or self.language_code
                         }
                         self.last_interim_transcript = clean_transcript
                         
         except Exception as e:
-            print(f"WebSocket audio processing error: {e}")
+            logger.error(f"WebSocket audio processing error: {e}")
             self.error_count += 1
             self.last_error = str(e)
             yield {
                 "type": "error",
                 "message": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _utc_timestamp()
             }
     
     def stop_streaming(self):
@@ -537,24 +646,29 @@ class STTService:
         if self.stream:
             self.stream.stop_stream()
             self.stream.close()
+            self.stream = None
         
-        # Don't terminate audio here as it might be used by other services
-        # self.audio.terminate()
+        # Don't terminate audio here as it might be used by other services;
+        # the shared PortAudio handle is released in close()
         
-        print("✅ Speech-to-text streaming stopped")
+        logger.info("✅ Speech-to-text streaming stopped")
+    
+    def close(self):
+        """Stop streaming and release process-wide resources held by this service."""
+        self.stop_streaming()
+        self._monitor_stop.set()
+        if self.audio is not None:
+            self.audio = None
+            release_pa()
     
     def restart_streaming(self):
         """Restart streaming if it gets stuck or stops working."""
-        print("🔄 Restarting streaming...")
+        logger.info("🔄 Restarting streaming...")
         self.stop_streaming()
         
         # Clear queues to prevent stale data
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-            except queue.Empty:
-                break
-                
+        self.audio_queue.clear()
+        
         while not self.result_queue.empty():
             try:
                 self.result_queue.get_nowait()
@@ -567,7 +681,7 @@ class STTService:
         self.last_result_time = 0
         self.last_heartbeat = time.time()
         
-        print("✅ Streaming restarted")
+        logger.info("✅ Streaming restarted")
     
     async def transcribe_audio_file(self, audio_data: bytes, language_code: str = None) -> Dict[str, Any]:
         """Transcribe audio from file data."""
@@ -576,33 +690,58 @@ class STTService:
         
         try:
             # Configure recognition
-            config = speech.RecognitionConfig(
-                encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                sample_rate_hertz=self.sample_rate,
-                language_code=language_code or self.language_code,
-                enable_automatic_punctuation=True,
-                model="latest_long",
-                use_enhanced=True,
-            )
+            config = _recognition_config(self.sample_rate, language_code or self.language_code)
+            
+            samples = np.frombuffer(audio_data, dtype=np.int16, count=len(audio_data) // 2)
+            
+            # Accidental triggers and silent clips would still pay a full
+            # network round-trip only to come back empty
+            if len(samples) < MIN_AUDIO_SECONDS * self.sample_rate or self._rms(samples) < MIN_AUDIO_RMS:
+                return {
+                    "status": "success",
+                    "results": [],
+                    "timestamp": _utc_timestamp()
+                }
             
-            audio = speech.RecognitionAudio(content=audio_data)
+            segments = self._split_on_silence(samples)
             
-            # Perform the recognition
-            response = self.speech_client.recognize(config=config, audio=audio)
+            config_pb = speech.RecognitionConfig.pb(config)
+            
+            def recognize(segment: Tuple[int, int]):
+                start, end = segment
+                # The last segment runs to the end of the buffer so a trailing
+                # odd byte is not silently dropped
+                chunk = audio_data[start * 2:] if end >= len(samples) else audio_data[start * 2:end * 2]
+                # Build the raw protobuf request and assign the audio bytes
+                # directly, skipping the proto-plus marshalling layer
+                request_pb = _RecognizeRequestPb(config=config_pb)
+                request_pb.audio.content = chunk
+                return self.speech_client.recognize(request=speech.RecognizeRequest.wrap(request_pb))
+            
+            # Perform the recognition, one request per segment in parallel
+            if len(segments) == 1:
+                responses = [recognize(segments[0])]
+            else:
+                loop = asyncio.get_running_loop()
+                with ThreadPoolExecutor(max_workers=min(MAX_RECOGNIZE_WORKERS, len(segments))) as executor:
+                    responses = await asyncio.gather(
+                        *(loop.run_in_executor(executor, recognize, segment) for segment in segments)
+                    )
             
             results = []
-            for result in response.results:
-                alternative = result.alternatives[0]
-                results.append({
-                    "transcript": alternative.transcript,
-                    "confidence": alternative.confidence,
-                    "language": language_code or self.language_code
-                })
+            for response in responses:
+                for result in response.results:
+                    alternative = result.alternatives[0]
+                    results.append({
+                        "transcript": alternative.transcript,
+                        "confidence": alternative.confidence,
+                        "language": language_code or self.language_code
+                    })
             
             return {
                 "status": "success",
                 "results": results,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _utc_timestamp()
             }
             
         except Exception as e:
@@ -611,44 +750,102 @@ class STTService:
             return {
                 "status": "error",
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _utc_timestamp()
             }
     
-    def get_statistics(self) -> Dict[str, Any]:
-        """Get service statistics and performance metrics."""
-        stats = {
-            "is_initialized": self.is_initialized,
-            "is_streaming": self.is_streaming,
-            "processed_chunks": self.processed_chunks,
-            "total_transcripts": self.total_transcripts,
-            "error_count": self.error_count,
-            "last_error": self.last_error,
-            "average_confidence": (
-                self.total_confidence / self.total_transcripts 
-                if self.total_transcripts > 0 else 0
-            )
-        }
+    @staticmethod
+    def _rms(audio: np.ndarray) -> float:
+        """Root-mean-square level of int16 PCM as a fraction of full scale."""
+        if not len(audio):
+            return 0.0
+        return float(np.sqrt(np.mean(np.square(audio.astype(np.int32))))) / 32768.0
+    
+    def _split_on_silence(self, audio: np.ndarray, min_silence_ms: int = 400) -> List[Tuple[int, int]]:
+        """
+        Split int16 PCM into (start, end) sample ranges, cutting in pauses.
         
-        if self.start_time:
-            elapsed = time.time() - self.start_time
-            stats.update({
-                "uptime_seconds": elapsed,
-                "chunks_per_second": self.processed_chunks / elapsed if elapsed > 0 else 0
-            })
+        Audio up to SEGMENT_TARGET_SECONDS is returned as a single range. Longer
+        audio is cut in the middle of the first pause of at least min_silence_ms
+        after the target length, never exceeding SEGMENT_MAX_SECONDS per range.
+        """
+        total = len(audio)
+        target = int(SEGMENT_TARGET_SECONDS * self.sample_rate)
+        if total <= target:
+            return [(0, total)]
+        
+        # Mean absolute amplitude per 20 ms frame
+        frame = self.sample_rate // 50
+        n_frames = total // frame
+        energy = np.abs(audio[:n_frames * frame].astype(np.int32)).reshape(n_frames, frame).mean(axis=1)
+        
+        # Midpoints of sufficiently long silent runs are candidate cut points
+        silent = np.concatenate(([False], energy < SILENCE_THRESHOLD, [False]))
+        edges = np.flatnonzero(silent[1:] != silent[:-1])
+        run_starts, run_ends = edges[::2], edges[1::2]
+        long_runs = (run_ends - run_starts) >= max(1, min_silence_ms // 20)
+        cuts = ((run_starts[long_runs] + run_ends[long_runs]) // 2) * frame
+        
+        max_len = int(SEGMENT_MAX_SECONDS * self.sample_rate)
+        segments = []
+        start = 0
+        while total - start > target:
+            limit = start + max_len
+            after_target = cuts[(cuts >= start + target) & (cuts <= limit)]
+            if len(after_target):
+                end = int(after_target[0])
+            else:
+                before_limit = cuts[(cuts > start) & (cuts <= limit)]
+                end = int(before_limit[-1]) if len(before_limit) else min(limit, total)
+            segments.append((start, end))
+            start = end
+        if start < total:
+            segments.append((start, total))
+        return segments
+    
+    def _record_transcript(self, confidence: Optional[float]):
+        """Add one final transcript to the running confidence sum."""
+        with self._stats_lock:
+            self.total_transcripts += 1
+            self.total_confidence += confidence if confidence else 0
+    
+    def get_statistics(self, as_dict: bool = True):
+        """
+        Get service statistics and performance metrics.
         
-        if self.enable_monitoring:
-            stats.update({
-                "cpu_percent": psutil.cpu_percent(),
-                "memory_percent": psutil.virtual_memory().percent
-            })
+        Args:
+            as_dict: Return a plain dict (for JSON responses) instead of an STTStats tuple
+        """
+        with self._stats_lock:
+            total_transcripts = self.total_transcripts
+            total_confidence = self.total_confidence
         
-        return stats
+        uptime_seconds = chunks_per_second = None
+        if self.start_time:
+            uptime_seconds = time.time() - self.start_time
+            chunks_per_second = self.processed_chunks / uptime_seconds if uptime_seconds > 0 else 0
+        
+        monitoring = self.enable_monitoring
+        stats = STTStats(
+            self.is_initialized,
+            self.is_streaming,
+            self.processed_chunks,
+            total_transcripts,
+            self.error_count,
+            self.last_error,
+            total_confidence / total_transcripts if total_transcripts > 0 else 0,
+            uptime_seconds,
+            chunks_per_second,
+            self._cpu_percent if monitoring else None,
+            self._memory_percent if monitoring else None,
+        )
+        return stats._asdict() if as_dict else stats
     
     def reset_statistics(self):
         """Reset service statistics."""
         self.processed_chunks = 0
-        self.total_transcripts = 0
-        self.total_confidence = 0.0
+        with self._stats_lock:
+            self.total_transcripts = 0
+            self.total_confidence = 0.0
         self.error_count = 0
         self.last_error = None
         self.start_time = None
@@ -657,10 +854,16 @@ class STTService:
         """Set the input device and channel configuration."""
         self.input_device_index = device_index
         self.channels = channels
-        print(f"✓ Input device set to index: {device_index}, channels: {channels}")
+        logger.info(f"✓ Input device set to index: {device_index}, channels: {channels}")
     
     def get_input_devices(self) -> List[Dict[str, Any]]:
         """Get list of available audio input devices with their properties."""
+        # Enumerating PortAudio devices is a round-trip per device; the UI polls
+        # this endpoint, so serve a recent scan when we have one.
+        now = time.time()
+        if self._devices_cache and now - self._devices_cache[0] < DEVICE_CACHE_TTL:
+            return self._devices_cache[1]
+        
         devices = []
         
         try:
@@ -677,11 +880,12 @@ class STTService:
                         'host_api': device_info.get('hostApi', 0)
                     })
             
-            print(f"✓ Found {len(devices)} audio input devices")
+            logger.info(f"✓ Found {len(devices)} audio input devices")
+            self._devices_cache = (now, devices)
             return devices
             
         except Exception as e:
-            print(f"✗ Error getting input devices: {e}")
+            logger.error(f"✗ Error getting input devices: {e}")
             return []
 
 
@@ -707,6 +911,8 @@ def initialize_stt_service(
     """Initialize the global STT service."""
     global _stt_service
     try:
+        if _stt_service is not None:
+            _stt_service.close()
         _stt_service = STTService(
             sample_rate=sample_rate,
             chunk_size=chunk_size,
@@ -716,5 +922,5 @@ def initialize_stt_service(
         )
         return True
     except Exception as e:
-        print(f"Failed to initialize STT service: {e}")
+        logger.error(f"Failed to initialize STT service: {e}")
         return False
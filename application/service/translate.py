@@ -4,19 +4,35 @@ Provides real-time translation capabilities for streaming text input
 """
 
 import asyncio
+import contextvars
+import hashlib
+import heapq
 import logging
 import os
+import re
+import sqlite3
+import sys
+import threading
 import time
 import json
-from typing import Dict, List, Optional, AsyncGenerator, Any
+import statistics
+import types
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, AsyncGenerator, Any, Tuple
 from datetime import datetime
 
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+try:
+    import gcld3
+except ImportError:
+    gcld3 = None  # Optional: pip install gcld3 for local language detection
 
 from config import get_settings
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Comprehensive language map for display names and supported languages
@@ -68,12 +84,135 @@ SUPPORTED_LANGUAGES = [
 
 LANGUAGE_NAME_MAP = {lang["code"]: lang["name"] for lang in SUPPORTED_LANGUAGES}
 
+# The language list never changes at runtime: hand out one read-only view
+# instead of rebuilding it per request
+_SUPPORTED_LANGUAGES_VIEW = tuple(types.MappingProxyType(lang) for lang in SUPPORTED_LANGUAGES)
+
+
+# Upper bound on buffered characters per streamed translation request
+MAX_BATCH_CHARS = 25000
+
+# How long a failed request is answered from the negative cache instead of
+# being retried: quota errors clear quickly, server outages take longer
+NEGATIVE_CACHE_TTL = (
+    (google_exceptions.ResourceExhausted, 5.0),
+    (google_exceptions.ServerError, 30.0),
+)
+
+# Language detections remembered per text
+DETECT_CACHE_SIZE = 1024
+
+# Local (CLD3) detections at least this certain skip the Gemini call
+LOCAL_DETECT_MIN_PROBABILITY = 0.9
+
+# Terminal echo of translations: bounded backlog and results written per flush
+DISPLAY_QUEUE_SIZE = 256
+DISPLAY_BATCH_SIZE = 16
+
+# Texts longer than this are translated sentence by sentence so each sentence
+# can be cached and the request stays well inside the model's output budget
+SENTENCE_SPLIT_CHARS = 600
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。！？])(\s+)")
+
+# Set while the sentences of a long text are translated: only the assembled
+# translation is counted in the statistics and echoed, not each sentence
+_sentence_part = contextvars.ContextVar("sentence_part", default=False)
+
 
 def _get_language_name(code: str) -> str:
     """Get human-readable language name from code."""
     return LANGUAGE_NAME_MAP.get(code, code)
 
 
+def _same_language(source: str, target: str) -> bool:
+    """
+    Whether translating between two language codes is a no-op.
+    
+    Regional variants ('en-US' vs 'en') count as the same language; Chinese
+    variants do not, since 'zh' and 'zh-TW' differ in script.
+    """
+    source, target = source.lower(), target.lower()
+    if source == target:
+        return True
+    primary = source.split("-")[0]
+    return primary != "zh" and primary == target.split("-")[0]
+
+
+@lru_cache(maxsize=256)
+def _translate_prompt_prefix(source_lang: str, target_lang: str) -> str:
+    """Instruction text for translating one string; the text itself is appended."""
+    return (
+        f"Translate the following text from {_get_language_name(source_lang)} "
+        f"to {_get_language_name(target_lang)}.\n"
+        f"Reply with ONLY the translated text. Do not include any explanation, "
+        f"notes, or the original text.\n\n"
+        f"Text to translate:\n"
+    )
+
+
+@lru_cache(maxsize=256)
+def _batch_prompt_prefix(source_lang: Optional[str], target_lang: str) -> str:
+    """Instruction text for translating a JSON array; the array itself is appended."""
+    from_clause = f" from {_get_language_name(source_lang)}" if source_lang else ""
+    return (
+        f"Translate the text of each item in the following JSON array{from_clause} "
+        f"to {_get_language_name(target_lang)}.\n"
+        f"Reply with one object per item, giving the item's id and its translation.\n\n"
+    )
+
+
+_DETECT_PROMPT_PREFIX = (
+    "Detect the language of the following text. Give language_code as "
+    "an ISO 639-1 code and confidence between 0.0 and 1.0.\n\n"
+    "Text:\n"
+)
+
+
+@lru_cache(maxsize=1)
+def _get_language_identifier():
+    """Shared CLD3 identifier, or None when gcld3 is not installed."""
+    if gcld3 is None:
+        return None
+    return gcld3.NNetLanguageIdentifier(min_num_bytes=0, max_num_bytes=1000)
+
+
+@dataclass
+class StreamSession:
+    """Rolling-transcript state for one translate_stream call"""
+    last_sent: str = ""
+    # Latest chunk that ended a sentence, and its translation once known
+    prefix: str = ""
+    prefix_translation: Tuple[str, str] = ("", "")
+    
+    def delta(self, chunk: str) -> Optional[str]:
+        """
+        Return the new suffix when chunk extends the latest sentence-ending chunk
+        
+        The prefix must cover more than half of the chunk, so the earlier
+        translation is reused only where it carries most of the text.
+        """
+        prefix = self.prefix
+        if prefix and chunk.startswith(prefix) and len(prefix) > len(chunk) / 2:
+            return chunk[len(prefix):].strip() or None
+        return None
+    
+    @staticmethod
+    def ends_sentence(chunk: str) -> bool:
+        return chunk[-1] in ".!?。！？"
+
+
+@lru_cache(maxsize=None)
+def _get_model(api_key: str, model_name: str) -> genai.GenerativeModel:
+    """Process-wide Gemini model, so every service instance shares one client."""
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name)
+
+
+# gRPC channels do not survive fork(); forked workers build their own client
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_get_model.cache_clear)
+
+
 class TranslationService:
     """
     Live translation service using Google Gemini LLM
@@ -84,7 +223,10 @@ class TranslationService:
         """Initialize the translation service"""
         self.settings = get_settings()
         self.model: Optional[genai.GenerativeModel] = None
+        self.model_name: str = getattr(self.settings, "gemini_model", "gemini-2.0-flash")
         self.is_initialized = False
+        # Connectivity is confirmed by the first successful model call
+        self._verified = False
         self.translation_queue: asyncio.Queue = asyncio.Queue()
         self.active_translations: Dict[str, Dict] = {}
         
@@ -94,9 +236,78 @@ class TranslationService:
             "successful_translations": 0,
             "failed_translations": 0,
             "average_latency_ms": 0,
-            "last_translation_time": None
+            "last_translation_time": None,
+            "cache_hits": 0,
+            "suppressed_failures": 0
         }
         
+        # Latencies of recent model calls, for percentile reporting
+        self._latency_count = 0
+        self._recent_latencies: deque = deque(maxlen=1024)
+        
+        # LRU cache of successful translations. Lookups and inserts happen
+        # without an await in between, so the event loop keeps them atomic.
+        self._cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._cache_size = self.settings.translation_cache_size
+        
+        # Detection replies are constrained to a JSON object by the API
+        # itself; temperature 0 keeps them deterministic and cacheable
+        self._detect_config = genai.GenerationConfig(
+            response_mime_type="application/json",
+            response_schema={
+                "type": "object",
+                "properties": {
+                    "language_code": {"type": "string"},
+                    "confidence": {"type": "number"}
+                },
+                "required": ["language_code"]
+            },
+            temperature=0
+        )
+        
+        # Batch replies: one {id, translation} object per input item
+        self._batch_config = genai.GenerationConfig(
+            response_mime_type="application/json",
+            response_schema={
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "translation": {"type": "string"}
+                    },
+                    "required": ["id", "translation"]
+                }
+            }
+        )
+        
+        # Sliding window on outstanding Gemini requests, tunable to the quota
+        self._sem = asyncio.Semaphore(self.settings.gemini_max_concurrency)
+        
+        # Detected languages by text digest
+        self._detect_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        
+        # Cache misses currently being translated, keyed like the cache
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        
+        # Recent quota/server failures: key -> (monotonic expiry, failure result)
+        self._neg_cache: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+        
+        # Persistent second tier behind the LRU so restarts keep translations.
+        # The connection is shared by executor threads, hence the lock.
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._db_ttl_seconds = self.settings.translation_cache_ttl_hours * 3600
+        self._db_last_sweep = 0.0
+        
+        # Terminal echo runs in a background task so stdout never blocks a
+        # translation; started on first use since it needs the running loop
+        self._verbose_display = self.settings.translation_verbose_display
+        self._display_queue: Optional[asyncio.Queue] = None
+        self._display_task: Optional[asyncio.Task] = None
+        self._fork_hook_registered = False
+        self._warm_up_task: Optional[asyncio.Task] = None
+        
     def initialize(self) -> bool:
         """
         Initialize the Google Gemini client
@@ -110,27 +321,142 @@ class TranslationService:
                 logger.error("❌ GOOGLE_API_KEY not set in environment / .env")
                 return False
 
-            genai.configure(api_key=api_key)
-
-            model_name = getattr(self.settings, "gemini_model", "gemini-2.0-flash")
-            self.model = genai.GenerativeModel(model_name)
+            self.model = _get_model(api_key, self.model_name)
+            self._open_cache_db()
+            
+            if hasattr(os, "register_at_fork") and not self._fork_hook_registered:
+                os.register_at_fork(after_in_child=self._reset_after_fork)
+                self._fork_hook_registered = True
 
-            # Test the connection
-            if self._test_connection():
-                self.is_initialized = True
-                logger.info(f"✅ Google Gemini translation service initialized (model: {model_name})")
-                return True
-            else:
-                logger.error("❌ Failed to test Google Gemini connection")
-                return False
+            # No test request here: the first translation verifies the
+            # connection, and healthcheck() is available for readiness probes
+            self.is_initialized = True
+            logger.info(f"✅ Google Gemini translation service initialized (model: {self.model_name})")
+            return True
                 
         except Exception as e:
             logger.error(f"❌ Failed to initialize Google Gemini translation service: {e}")
             return False
     
-    def _test_connection(self) -> bool:
+    def _reset_after_fork(self) -> None:
+        """Rebuild the Gemini client and cache connection inherited across fork()"""
+        if self.model is not None:
+            self.model = _get_model(self.settings.google_api_key, self.model_name)
+        if self._db is not None:
+            self._db = None
+            self._db_lock = threading.Lock()
+            self._open_cache_db()
+    
+    def _open_cache_db(self) -> None:
+        """Open (or create) the SQLite translation cache; failures only disable the tier"""
+        db_path = self.settings.translation_cache_db
+        if not db_path or self._db is not None:
+            return
+        try:
+            db = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS tm ("
+                "hash BLOB NOT NULL, src TEXT NOT NULL, tgt TEXT NOT NULL, model TEXT NOT NULL, "
+                "translated TEXT NOT NULL, source_lang TEXT, created_at INTEGER NOT NULL, "
+                "PRIMARY KEY (hash, src, tgt, model))"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS tm_created_at ON tm (created_at)")
+            self._db = db
+            logger.info(f"Translation cache database: {db_path}")
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Translation cache database unavailable ({db_path}): {e}")
+    
+    def _db_lookup(self, key: Tuple) -> Optional[Tuple[str, Optional[str]]]:
+        """Return (translated_text, source_lang) for a cache key if stored and not expired"""
+        source_language, target_language, model, digest = key
+        with self._db_lock:
+            return self._db.execute(
+                "SELECT translated, source_lang FROM tm "
+                "WHERE hash = ? AND src = ? AND tgt = ? AND model = ? AND created_at >= ?",
+                (digest, source_language or "", target_language, model,
+                 int(time.time() - self._db_ttl_seconds))
+            ).fetchone()
+    
+    def _db_store(self, key: Tuple, result: Dict[str, Any]) -> None:
+        """Persist a successful translation and sweep expired rows about once an hour"""
+        source_language, target_language, model, digest = key
+        now = time.time()
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO tm VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (digest, source_language or "", target_language, model,
+                     result["translated_text"], result["source_language"], int(now))
+                )
+                if now - self._db_last_sweep > 3600:
+                    self._db.execute("DELETE FROM tm WHERE created_at < ?", (int(now - self._db_ttl_seconds),))
+                    self._db_last_sweep = now
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Failed to persist translation: {e}")
+    
+    async def _persistent_cache_get(self, key: Tuple, text: str) -> Optional[Dict[str, Any]]:
+        """Look up the SQLite tier; a hit is promoted into the in-memory LRU"""
+        if self._db is None:
+            return None
+        try:
+            row = await asyncio.to_thread(self._db_lookup, key)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Translation cache lookup failed: {e}")
+            return None
+        if row is None:
+            return None
+        
+        source_language, target_language = key[0], key[1]
+        translated_text, source_lang = row
+        entry = {
+            "original_text": text,
+            "translated_text": translated_text,
+            "source_language": source_lang,
+            "target_language": target_language,
+            "detected_language": source_lang if not source_language else None,
+            "model": self.model_name,
+            "mime_type": "text/plain",
+            "latency_ms": 0.0,
+            "timestamp_ns": None,
+            "success": True
+        }
+        self._cache_put(key, entry)
+        return self._cache_hit(entry)
+    
+    def _persistent_cache_put(self, key: Tuple, result: Dict[str, Any]) -> None:
+        """Write a translation to the SQLite tier in the background"""
+        if self._db is not None:
+            asyncio.get_running_loop().run_in_executor(None, self._db_store, key, result)
+    
+    async def _generate(self, prompt: str, generation_config: Optional[genai.GenerationConfig] = None):
+        """Send one prompt to Gemini, waiting for a free concurrency slot"""
+        async with self._sem:
+            return await self.model.generate_content_async(prompt, generation_config=generation_config)
+    
+    def start_warm_up(self) -> None:
         """
-        Test the connection to Google Gemini API
+        Open the Gemini connection in the background
+        
+        A count_tokens call sets up the channel (TCP, TLS, HTTP/2) so the
+        first real translation does not pay for the handshake. Token
+        counting does not use generation quota.
+        """
+        if self.is_initialized and self._warm_up_task is None:
+            self._warm_up_task = asyncio.get_running_loop().create_task(self._warm_up())
+    
+    async def _warm_up(self) -> None:
+        try:
+            await self.model.count_tokens_async("Hello")
+        except Exception as e:
+            logger.warning(f"⚠️ Gemini connection warm-up failed: {e}")
+    
+    async def healthcheck(self) -> bool:
+        """
+        Test the connection to Google Gemini API with a live request
+        
+        This costs one API call, so it is only run on demand.
         
         Returns:
             bool: True if connection successful, False otherwise
@@ -139,11 +465,12 @@ class TranslationService:
             if not self.model:
                 return False
                 
-            response = self.model.generate_content(
+            response = await self.model.generate_content_async(
                 "Translate 'Hello' to Spanish. Reply with ONLY the translated text, nothing else."
             )
             result = response.text.strip()
-            return len(result) > 0
+            self._verified = len(result) > 0
+            return self._verified
             
         except Exception as e:
             logger.error(f"Connection test failed: {e}")
@@ -165,7 +492,8 @@ class TranslationService:
             source_language: Source language code (e.g., 'en')
             target_language: Target language code (e.g., 'es')
             model: Unused (kept for interface compatibility)
-            mime_type: Unused (kept for interface compatibility)
+            mime_type: 'text/html' keeps long input in one request instead of
+                splitting it into sentences
             
         Returns:
             Dict containing translation result and metadata
@@ -178,77 +506,528 @@ class TranslationService:
         try:
             target_lang = target_language or self.settings.default_target_language
             
+            if source_language and _same_language(source_language, target_lang):
+                return self._identity_result(text, source_language, target_lang)
+            
+            cache_key = self._cache_key(text, source_language, target_lang, self.model_name)
+            result = self._cache_get(cache_key)
+            if result is not None:
+                self._display_translation(result)
+                return result
+            
+            failure = self._suppressed_failure(cache_key)
+            if failure is not None:
+                return failure
+        except Exception as e:
+            return self._failure_result(text, e)
+        
+        # Identical requests already in flight share that request's result; if
+        # that request was abandoned, translate the text here instead
+        flight = self._inflight.get(cache_key)
+        if flight is not None:
+            result = await self._await_inflight(flight)
+            if result is not None:
+                return result
+            return await self.translate_text(text, source_language, target_language, model, mime_type)
+        
+        flight = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = flight
+        try:
+            result = await self._translate_uncached(
+                text, source_language, target_lang, mime_type, cache_key, start_time
+            )
+            flight.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(cache_key, None)
+            # Cancelling the shared future would cancel every waiter with it
+            if not flight.done():
+                flight.set_result(None)
+    
+    async def translate_text_stream(
+        self,
+        text: str,
+        source_language: Optional[str] = None,
+        target_language: Optional[str] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Translate a single text string, yielding the translation as Gemini decodes it
+        
+        Cached and same-language texts are yielded whole. A completed
+        translation is cached like one from translate_text.
+        
+        Args:
+            text: Text to translate
+            source_language: Source language code; detected if omitted
+            target_language: Target language code (e.g., 'es')
+            
+        Yields:
+            Successive pieces of the translated text
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Translation service not initialized")
+        
+        start_time = time.time()
+        target_lang = target_language or self.settings.default_target_language
+        
+        if source_language and _same_language(source_language, target_lang):
+            yield self._identity_result(text, source_language, target_lang)["translated_text"]
+            return
+        
+        cache_key = self._cache_key(text, source_language, target_lang, self.model_name)
+        result = self._cache_get(cache_key) or await self._persistent_cache_get(cache_key, text)
+        if result is not None:
+            yield result["translated_text"]
+            return
+        
+        source_lang = source_language
+        if not source_lang:
+            detection_result = await self.detect_language(text)
+            source_lang = detection_result.get("language_code") or self.settings.default_source_language
+        
+        # The upstream stream is drained by its own task, which holds the
+        # concurrency slot only while Gemini is decoding; a slow client reads
+        # from the local queue without keeping other requests waiting
+        received: asyncio.Queue = asyncio.Queue()
+        
+        async def pump() -> None:
+            try:
+                async with self._sem:
+                    response = await self.model.generate_content_async(
+                        _translate_prompt_prefix(source_lang, target_lang) + text, stream=True
+                    )
+                    async for chunk in response:
+                        received.put_nowait(chunk.text)
+                received.put_nowait(None)
+            except Exception as e:
+                received.put_nowait(e)
+        
+        pump_task = asyncio.get_running_loop().create_task(pump())
+        pieces = []
+        try:
+            while (piece := await received.get()) is not None:
+                if isinstance(piece, Exception):
+                    self._failure_result(text, piece, cache_key)
+                    raise piece
+                pieces.append(piece)
+                yield piece
+        finally:
+            # Stops the upstream request if the client went away
+            pump_task.cancel()
+        
+        self._verified = True
+        latency_ms = (time.time() - start_time) * 1000
+        self._record_success(latency_ms)
+        result = {
+            "original_text": text,
+            "translated_text": "".join(pieces).strip(),
+            "source_language": source_lang,
+            "target_language": target_lang,
+            "detected_language": source_lang if not source_language else None,
+            "model": self.model_name,
+            "mime_type": "text/plain",
+            "latency_ms": round(latency_ms, 2),
+            "timestamp_ns": time.time_ns(),
+            "success": True
+        }
+        self._cache_put(cache_key, result)
+        self._persistent_cache_put(cache_key, result)
+        self._display_translation(result)
+    
+    async def _await_inflight(self, flight: asyncio.Future) -> Optional[Dict[str, Any]]:
+        """
+        Wait for another call's translation of the same key and share its result
+        
+        Returns None when that call ended without a result (it was
+        cancelled), so the caller translates the text itself.
+        """
+        try:
+            shared = await asyncio.shield(flight)
+        except asyncio.CancelledError:
+            # Only swallow the flight's own cancellation, never this waiter's
+            if not flight.cancelled():
+                raise
+            return None
+        if shared is None:
+            return None
+        if shared["success"]:
+            return self._cache_hit(shared)
+        if not _sentence_part.get():
+            self.stats["failed_translations"] += 1
+        return dict(shared)
+    
+    async def _translate_uncached(
+        self,
+        text: str,
+        source_language: Optional[str],
+        target_lang: str,
+        mime_type: Optional[str],
+        cache_key: Tuple,
+        start_time: float
+    ) -> Dict[str, Any]:
+        """Translate text that missed the in-memory cache"""
+        try:
+            result = await self._persistent_cache_get(cache_key, text)
+            if result is not None:
+                self._display_translation(result)
+                return result
+            
             # Auto-detect source language if not provided
             if source_language:
                 source_lang = source_language
             else:
-                detection_result = self.detect_language(text)
+                detection_result = await self.detect_language(text)
                 if detection_result.get("language_code"):
                     source_lang = detection_result["language_code"]
-                    logger.info(f"🔍 Auto-detected source language: {source_lang}")
+                    logger.info("🔍 Auto-detected source language: %s", source_lang)
                 else:
                     source_lang = self.settings.default_source_language
                     logger.warning(f"⚠️ Language detection failed, using default: {source_lang}")
             
-            source_name = _get_language_name(source_lang)
-            target_name = _get_language_name(target_lang)
-
-            prompt = (
-                f"Translate the following text from {source_name} to {target_name}.\n"
-                f"Reply with ONLY the translated text. Do not include any explanation, "
-                f"notes, or the original text.\n\n"
-                f"Text to translate:\n{text}"
-            )
+            # HTML is left whole so tags are never split across sentences
+            translated_text = None
+            if len(text) > SENTENCE_SPLIT_CHARS and mime_type != "text/html":
+                translated_text = await self._translate_sentences(text, source_lang, target_lang)
+            
+            if translated_text is None:
+                prompt = _translate_prompt_prefix(source_lang, target_lang) + text
 
-            # Run the synchronous Gemini call in a thread to keep async
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None, self.model.generate_content, prompt
-            )
+                response = await self._generate(prompt)
 
-            translated_text = response.text.strip()
+                translated_text = response.text.strip()
+                self._verified = True
 
             # Calculate latency
             latency_ms = (time.time() - start_time) * 1000
             
             # Update statistics
-            self.stats["total_translations"] += 1
-            self.stats["successful_translations"] += 1
-            self.stats["last_translation_time"] = datetime.utcnow().isoformat()
+            self._record_success(latency_ms)
             
-            if self.stats["average_latency_ms"] == 0:
-                self.stats["average_latency_ms"] = latency_ms
-            else:
-                self.stats["average_latency_ms"] = (self.stats["average_latency_ms"] + latency_ms) / 2
-            
-            gemini_model = getattr(self.settings, "gemini_model", "gemini-2.0-flash")
-
             result = {
                 "original_text": text,
                 "translated_text": translated_text,
                 "source_language": source_lang,
                 "target_language": target_lang,
                 "detected_language": source_lang if not source_language else None,
-                "model": gemini_model,
+                "model": self.model_name,
                 "mime_type": "text/plain",
                 "latency_ms": round(latency_ms, 2),
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp_ns": time.time_ns(),
                 "success": True
             }
             
+            self._cache_put(cache_key, result)
+            self._persistent_cache_put(cache_key, result)
             self._display_translation(result)
             return result
             
         except Exception as e:
+            return self._failure_result(text, e, cache_key)
+    
+    def _failure_result(self, text: str, error: Exception, cache_key: Optional[Tuple] = None) -> Dict[str, Any]:
+        """
+        Count and log a failed translation and build its result
+        
+        Quota and server errors are remembered for cache_key for a short
+        while so immediate retries do not hit the API again.
+        """
+        if not _sentence_part.get():
             self.stats["failed_translations"] += 1
-            logger.error(f"Translation error: {e}")
-            return {
-                "original_text": text,
-                "translated_text": None,
-                "error": str(e),
-                "success": False,
-                "timestamp": datetime.utcnow().isoformat()
-            }
+        if isinstance(error, (google_exceptions.Unauthenticated, google_exceptions.PermissionDenied)):
+            logger.error(f"❌ Google Gemini rejected the credentials, check GOOGLE_API_KEY: {error}")
+        else:
+            logger.error(f"Translation error: {error}")
+        result = {
+            "original_text": text,
+            "translated_text": None,
+            "error": str(error),
+            "success": False,
+            "timestamp_ns": time.time_ns()
+        }
+        
+        ttl = next((ttl for error_type, ttl in NEGATIVE_CACHE_TTL if isinstance(error, error_type)), None)
+        if cache_key is not None and ttl is not None:
+            now = time.monotonic()
+            self._neg_cache = {k: v for k, v in self._neg_cache.items() if v[0] > now}
+            self._neg_cache[cache_key] = (now + ttl, result)
+        return result
+    
+    def _suppressed_failure(self, cache_key: Tuple) -> Optional[Dict[str, Any]]:
+        """Return a copy of a recent failure for cache_key and count it, or None"""
+        failure = self._neg_cache.get(cache_key)
+        if failure is None or failure[0] <= time.monotonic():
+            return None
+        if not _sentence_part.get():
+            self.stats["failed_translations"] += 1
+            self.stats["suppressed_failures"] += 1
+        return dict(failure[1])
+    
+    async def translate_batch(
+        self,
+        texts: List[str],
+        source_language: Optional[str] = None,
+        target_language: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Translate several independent texts with a single Gemini request
+        
+        Cached texts are answered locally; the rest are sent together as a
+        JSON array of {id, text} items and the structured reply is matched
+        back by id. Any text a malformed reply does not cover falls back to
+        translate_text; if the request itself fails, every uncached text
+        fails with it.
+        
+        Args:
+            texts: Texts to translate
+            source_language: Source language code; inferred by the model if omitted
+            target_language: Target language code (e.g., 'es')
+            
+        Returns:
+            One result dict per input text, in input order
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Translation service not initialized")
+        
+        target_lang = target_language or self.settings.default_target_language
+        
+        if source_language and _same_language(source_language, target_lang):
+            return [self._identity_result(text, source_language, target_lang) for text in texts]
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        keys = [self._cache_key(text, source_language, target_lang, self.model_name) for text in texts]
+        
+        # Claim every cache miss nobody else is translating; the rest wait
+        # for the call (or earlier item of this batch) that owns the key
+        loop = asyncio.get_running_loop()
+        owned: Dict[int, asyncio.Future] = {}
+        waiting: List[Tuple[int, asyncio.Future]] = []
+        for i, key in enumerate(keys):
+            results[i] = self._cache_get(key) or self._suppressed_failure(key)
+            if results[i] is not None:
+                continue
+            flight = self._inflight.get(key)
+            if flight is not None:
+                waiting.append((i, flight))
+            else:
+                owned[i] = self._inflight[key] = loop.create_future()
+        
+        try:
+            await self._translate_owned(texts, keys, list(owned), source_language, target_lang, results)
+            for i, flight in owned.items():
+                flight.set_result(results[i])
+        finally:
+            for i, flight in owned.items():
+                if self._inflight.get(keys[i]) is flight:
+                    del self._inflight[keys[i]]
+                if not flight.done():
+                    flight.set_result(None)
+        
+        for i, flight in waiting:
+            results[i] = await self._await_inflight(flight)
+            if results[i] is None:
+                results[i] = await self.translate_text(texts[i], source_language, target_lang)
+        
+        return results
+    
+    async def _translate_owned(
+        self,
+        texts: List[str],
+        keys: List[Tuple],
+        owned: List[int],
+        source_language: Optional[str],
+        target_lang: str,
+        results: List[Optional[Dict[str, Any]]]
+    ) -> None:
+        """Fill in results for the batch items this call is responsible for"""
+        misses = []
+        for i in owned:
+            results[i] = await self._persistent_cache_get(keys[i], texts[i])
+            if results[i] is None:
+                misses.append(i)
+        
+        if misses:
+            start_time = time.time()
+            envelope = [{"id": n, "text": texts[i]} for n, i in enumerate(misses)]
+            prompt = _batch_prompt_prefix(source_language, target_lang) + json.dumps(envelope, ensure_ascii=False)
+            
+            try:
+                response = await self._generate(prompt, generation_config=self._batch_config)
+            except Exception as e:
+                # Quota, server and credential errors would fail again for each
+                # item; fail them all and let the negative cache answer retries
+                for i in misses:
+                    results[i] = self._failure_result(texts[i], e, keys[i])
+                return
+            self._verified = True
+            
+            translations: Dict[int, str] = {}
+            try:
+                for item in json.loads(response.text):
+                    translations[int(item["id"])] = str(item["translation"])
+            except Exception as e:
+                logger.warning(f"⚠️ Batch reply could not be parsed ({e}), translating individually")
+            
+            # Items the reply did not account for are translated one by one;
+            # this call still owns their keys, so bypass request coalescing
+            unmatched = [i for n, i in enumerate(misses) if n not in translations]
+            if unmatched:
+                fallback = await asyncio.gather(*(
+                    self._translate_uncached(texts[i], source_language, target_lang, None, keys[i], time.time())
+                    for i in unmatched
+                ))
+                for i, result in zip(unmatched, fallback):
+                    results[i] = result
+            
+            latency_ms = (time.time() - start_time) * 1000
+            timestamp_ns = time.time_ns()
+            for n, i in enumerate(misses):
+                if n not in translations:
+                    continue
+                self._record_success(latency_ms)
+                result = {
+                    "original_text": texts[i],
+                    "translated_text": translations[n].strip(),
+                    "source_language": source_language,
+                    "target_language": target_lang,
+                    "detected_language": None,
+                    "model": self.model_name,
+                    "mime_type": "text/plain",
+                    "latency_ms": round(latency_ms, 2),
+                    "timestamp_ns": timestamp_ns,
+                    "success": True
+                }
+                self._cache_put(keys[i], result)
+                self._persistent_cache_put(keys[i], result)
+                self._display_translation(result)
+                results[i] = result
+    
+    async def _translate_sentences(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str
+    ) -> Optional[str]:
+        """
+        Translate long text per sentence through translate_batch
+        
+        Sentences are cached individually, so only the ones not seen before
+        reach the model. The original whitespace between sentences is kept.
+        Returns None when the text has no sentence boundary to split on.
+        """
+        # Even indices are sentences, odd indices the whitespace between them
+        parts = _SENTENCE_BOUNDARY.split(text)
+        if len(parts) < 3:
+            return None
+        
+        # Repeated sentences are sent once
+        positions: Dict[str, List[int]] = {}
+        for i in range(0, len(parts), 2):
+            if parts[i].strip():
+                positions.setdefault(parts[i], []).append(i)
+        
+        groups: List[List[str]] = [[]]
+        group_chars = 0
+        for sentence in positions:
+            if groups[-1] and group_chars + len(sentence) > MAX_BATCH_CHARS:
+                groups.append([])
+                group_chars = 0
+            groups[-1].append(sentence)
+            group_chars += len(sentence)
+        
+        # The batch tasks copy the current context, so they see the flag
+        token = _sentence_part.set(True)
+        try:
+            batches = await asyncio.gather(*(
+                self.translate_batch(group, source_lang, target_lang) for group in groups
+            ))
+        finally:
+            _sentence_part.reset(token)
+        
+        for group, results in zip(groups, batches):
+            for sentence, result in zip(group, results):
+                if not result["success"]:
+                    raise RuntimeError(result.get("error") or "sentence translation failed")
+                for i in positions[sentence]:
+                    parts[i] = result["translated_text"]
+        
+        return "".join(parts)
+    
+    def _identity_result(self, text: str, source_lang: str, target_lang: str) -> Dict[str, Any]:
+        """Result for a request whose source and target language are the same"""
+        timestamp_ns = time.time_ns()
+        if not _sentence_part.get():
+            self.stats["total_translations"] += 1
+            self.stats["successful_translations"] += 1
+            self.stats["last_translation_time"] = timestamp_ns
+        return {
+            "original_text": text,
+            "translated_text": text,
+            "source_language": source_lang,
+            "target_language": target_lang,
+            "detected_language": None,
+            "model": self.model_name,
+            "mime_type": "text/plain",
+            "latency_ms": 0.0,
+            "timestamp_ns": timestamp_ns,
+            "success": True,
+            "cached": "identity"
+        }
+    
+    def _record_success(self, latency_ms: float) -> None:
+        """Update statistics for one translation served by the model"""
+        if _sentence_part.get():
+            return
+        stats = self.stats
+        stats["total_translations"] += 1
+        stats["successful_translations"] += 1
+        stats["last_translation_time"] = time.time_ns()
+        
+        # Running arithmetic mean over model calls (cache hits are excluded)
+        self._latency_count += 1
+        previous = stats["average_latency_ms"]
+        stats["average_latency_ms"] = previous + (latency_ms - previous) / self._latency_count
+        self._recent_latencies.append(latency_ms)
+    
+    @staticmethod
+    def _cache_key(text: str, source_language: Optional[str], target_language: str, model: str) -> Tuple:
+        """
+        Build the translation cache key
+        
+        The requested source language is used (None for auto-detect) so hits
+        also skip detection. Output is always plain text, so the MIME type
+        does not discriminate entries.
+        """
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        return (source_language, target_language, model, digest)
+    
+    def _cache_get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Return a fresh copy of a cached translation and count the hit, or None"""
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        self._cache.move_to_end(key)
+        return self._cache_hit(cached)
+    
+    def _cache_hit(self, cached: Dict[str, Any]) -> Dict[str, Any]:
+        """Stamp a cached translation as a fresh result and count the hit"""
+        result = dict(cached, latency_ms=0.0, timestamp_ns=time.time_ns(), cached=True)
+        if _sentence_part.get():
+            return result
+        stats = self.stats
+        stats["total_translations"] += 1
+        stats["successful_translations"] += 1
+        stats["cache_hits"] += 1
+        stats["last_translation_time"] = result["timestamp_ns"]
+        return result
+    
+    def _cache_put(self, key: Tuple, result: Dict[str, Any]) -> None:
+        """Store a successful translation, evicting the least recently used entry"""
+        if self._cache_size <= 0:
+            return
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
     
     async def translate_stream(
         self,
@@ -258,11 +1037,23 @@ class TranslationService:
         model: Optional[str] = None,
         mime_type: Optional[str] = None,
         batch_size: int = 1,
-        delay_ms: int = 100
+        delay_ms: int = 100,
+        concurrency: int = 4,
+        rolling: bool = False
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Translate streaming text input in real-time
         
+        Buffered batches are handed to a pool of worker tasks so several
+        translations can be in flight while more text arrives. Each chunk
+        of a batch is translated as its own item of one batched request and
+        yields its own result, in input order.
+        
+        With rolling=True each chunk is a full transcript that may repeat the
+        previous one (live captions). When a chunk extends the previous one
+        past a sentence end, only the new suffix is translated and appended
+        to the previous translation.
+        
         Args:
             text_stream: Async generator yielding text chunks
             source_language: Source language code
@@ -270,7 +1061,9 @@ class TranslationService:
             model: Unused (kept for interface compatibility)
             mime_type: Unused (kept for interface compatibility)
             batch_size: Number of text chunks to process together
-            delay_ms: Delay between translations in milliseconds
+            delay_ms: Delay after each model call, per worker, in milliseconds
+            concurrency: Number of translations allowed in flight at once
+            rolling: Treat chunks as growing transcripts; batch_size is ignored
             
         Yields:
             Dict containing translation results
@@ -278,57 +1071,193 @@ class TranslationService:
         if not self.is_initialized:
             raise RuntimeError("Translation service not initialized")
         
-        buffer = []
+        concurrency = max(1, concurrency)
+        # Resolved once here rather than by every translation in the stream
+        target_language = target_language or self.settings.default_target_language
+        translate_text = self.translate_text
+        translate_batch = self.translate_batch
+        delay = delay_ms / 1000.0
+        in_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * concurrency)
+        out_queue: asyncio.Queue = asyncio.Queue()
+        producer_error: List[BaseException] = []
+        worker_error: List[BaseException] = []
+        
+        session = StreamSession()
         
-        async for text_chunk in text_stream:
-            if text_chunk.strip():
-                buffer.append(text_chunk.strip())
+        async def produce() -> None:
+            seq = 0
+            buffer = []
+            buffer_chars = 0
+            try:
+                async for text_chunk in text_stream:
+                    text_chunk = text_chunk.strip()
+                    if rolling and text_chunk and text_chunk != session.last_sent:
+                        # Suffix-only items carry (prefix, full chunk) for splicing
+                        delta = session.delta(text_chunk)
+                        if delta is None:
+                            await in_queue.put((seq, [text_chunk], None))
+                        else:
+                            await in_queue.put((seq, [delta], (session.prefix, text_chunk)))
+                        session.last_sent = text_chunk
+                        if session.ends_sentence(text_chunk):
+                            session.prefix = text_chunk
+                        seq += 1
+                    elif text_chunk and not rolling:
+                        buffer.append(text_chunk)
+                        buffer_chars += len(text_chunk)
+                        
+                        if len(buffer) >= batch_size or buffer_chars >= MAX_BATCH_CHARS:
+                            await in_queue.put((seq, buffer, None))
+                            seq += 1
+                            buffer = []
+                            buffer_chars = 0
                 
-                if len(buffer) >= batch_size:
-                    combined_text = " ".join(buffer)
-                    
-                    result = await self.translate_text(
-                        text=combined_text,
-                        source_language=source_language,
-                        target_language=target_language,
-                    )
-                    
-                    yield result
-                    buffer = []
+                # Process any remaining text in buffer
+                if buffer:
+                    await in_queue.put((seq, buffer, None))
+            except Exception as e:
+                producer_error.append(e)
+            finally:
+                for _ in range(concurrency):
+                    await in_queue.put(None)
+        
+        async def work() -> None:
+            try:
+                while True:
+                    item = await in_queue.get()
+                    if item is None:
+                        break
+                    seq, chunks, splice = item
+                    if len(chunks) == 1:
+                        results = [await translate_text(
+                            text=chunks[0],
+                            source_language=source_language,
+                            target_language=target_language,
+                        )]
+                    else:
+                        results = await translate_batch(chunks, source_language, target_language)
+                    await out_queue.put((seq, results, splice))
                     
-                    if delay_ms > 0:
-                        await asyncio.sleep(delay_ms / 1000.0)
-        
-        # Process any remaining text in buffer
-        if buffer:
-            combined_text = " ".join(buffer)
-            result = await self.translate_text(
-                text=combined_text,
-                source_language=source_language,
-                target_language=target_language,
-            )
-            yield result
+                    # The delay only paces model calls; cache hits made none
+                    if delay > 0 and not all(result.get("cached") for result in results):
+                        await asyncio.sleep(delay)
+            except Exception as e:
+                worker_error.append(e)
+            finally:
+                # Always signal the consumer, even when this worker failed
+                out_queue.put_nowait(None)
+        
+        tasks = [asyncio.create_task(produce())]
+        tasks += [asyncio.create_task(work()) for _ in range(concurrency)]
+        
+        try:
+            # Reorder completed batches by sequence number
+            pending: List[Tuple[int, List[Dict[str, Any]], Optional[Tuple[str, str]]]] = []
+            next_seq = 0
+            running = concurrency
+            while running:
+                item = await out_queue.get()
+                if item is None:
+                    if worker_error:
+                        raise worker_error[0]
+                    running -= 1
+                    continue
+                heapq.heappush(pending, item)  # Sequence numbers are unique
+                while pending and pending[0][0] == next_seq:
+                    _, results, splice = heapq.heappop(pending)
+                    if rolling:
+                        result = results[0]
+                        if splice is not None:
+                            prefix, full_chunk = splice
+                            prefix_text, prefix_translation = session.prefix_translation
+                            if not result["success"]:
+                                result = dict(result, original_text=full_chunk)
+                            elif prefix_text == prefix:
+                                result = dict(
+                                    result,
+                                    original_text=full_chunk,
+                                    translated_text=f"{prefix_translation} {result['translated_text']}"
+                                )
+                            else:
+                                # The prefix has no translation to reuse (it failed),
+                                # and the suffix alone is not the caption
+                                result = await translate_text(
+                                    text=full_chunk,
+                                    source_language=source_language,
+                                    target_language=target_language,
+                                )
+                        if result["success"] and session.ends_sentence(result["original_text"]):
+                            session.prefix_translation = (result["original_text"], result["translated_text"])
+                        results = [result]
+                    for result in results:
+                        yield result
+                    next_seq += 1
+            
+            if producer_error:
+                raise producer_error[0]
+        finally:
+            for task in tasks:
+                task.cancel()
     
     def _display_translation(self, result: Dict[str, Any]) -> None:
         """
-        Display translation result in terminal with formatting
+        Queue a translation result for the terminal display
+        
+        Does nothing unless translation_verbose_display is set. Results are
+        dropped rather than waited on when the display falls behind.
         
         Args:
             result: Translation result dictionary
         """
-        if result["success"]:
-            print("\n" + "="*80)
-            print(f"🔄 LIVE TRANSLATION - {result['timestamp']}")
-            print("="*80)
-            print(f"📝 Original ({result['source_language']}): {result['original_text']}")
-            print(f"🌍 Translated ({result['target_language']}): {result['translated_text']}")
-            print(f"⚡ Latency: {result['latency_ms']}ms")
-            print(f"🤖 Model: {result['model']}")
-            print("="*80)
-        else:
-            print(f"\n❌ Translation failed: {result.get('error', 'Unknown error')}")
+        if not self._verbose_display or _sentence_part.get():
+            return
+        loop = asyncio.get_running_loop()
+        if self._display_task is None or self._display_task.done() or self._display_task.get_loop() is not loop:
+            self._display_queue = asyncio.Queue(maxsize=DISPLAY_QUEUE_SIZE)
+            self._display_task = loop.create_task(self._display_worker())
+        try:
+            self._display_queue.put_nowait(result)
+        except asyncio.QueueFull:
+            pass
+    
+    async def _display_worker(self) -> None:
+        """Write queued results to stdout, coalescing bursts into one write"""
+        while True:
+            batch = [await self._display_queue.get()]
+            while len(batch) < DISPLAY_BATCH_SIZE and not self._display_queue.empty():
+                batch.append(self._display_queue.get_nowait())
+            sys.stdout.write("".join(self._format_translation(result) for result in batch))
+            sys.stdout.flush()
     
-    def get_supported_languages(self, target_language: str = "en") -> List[Dict[str, str]]:
+    def _format_translation(self, result: Dict[str, Any]) -> str:
+        """
+        Format a translation result for the terminal
+        
+        Args:
+            result: Translation result dictionary
+        """
+        if not result["success"]:
+            return f"\n❌ Translation failed: {result.get('error', 'Unknown error')}\n"
+        rule = "=" * 80
+        return (
+            f"\n{rule}\n"
+            f"🔄 LIVE TRANSLATION - {self.iso(result['timestamp_ns'])}\n"
+            f"{rule}\n"
+            f"📝 Original ({result['source_language']}): {result['original_text']}\n"
+            f"🌍 Translated ({result['target_language']}): {result['translated_text']}\n"
+            f"⚡ Latency: {result['latency_ms']}ms\n"
+            f"🤖 Model: {result['model']}\n"
+            f"{rule}\n"
+        )
+    
+    @staticmethod
+    def iso(timestamp_ns: Optional[int]) -> Optional[str]:
+        """Format a result's timestamp_ns as a UTC ISO-8601 string"""
+        if timestamp_ns is None:
+            return None
+        return datetime.utcfromtimestamp(timestamp_ns / 1e9).isoformat()
+    
+    def get_supported_languages(self, target_language: str = "en") -> Tuple[Mapping[str, str], ...]:
         """
         Get list of supported languages
         
@@ -336,14 +1265,14 @@ class TranslationService:
             target_language: Unused (kept for interface compatibility)
             
         Returns:
-            List of supported languages with codes and names
+            Read-only sequence of supported languages with codes and names
         """
         if not self.is_initialized:
             raise RuntimeError("Translation service not initialized")
         
-        return [lang.copy() for lang in SUPPORTED_LANGUAGES]
+        return _SUPPORTED_LANGUAGES_VIEW
     
-    def detect_language(self, text: str) -> Dict[str, Any]:
+    async def detect_language(self, text: str) -> Dict[str, Any]:
         """
         Detect the language of the input text using Gemini
         
@@ -356,34 +1285,44 @@ class TranslationService:
         if not self.is_initialized:
             raise RuntimeError("Translation service not initialized")
         
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        cached = self._detect_cache.get(digest)
+        if cached is not None:
+            self._detect_cache.move_to_end(digest)
+            return dict(cached, text=text, timestamp=datetime.utcnow().isoformat(), cached=True)
+        
+        # Confident local detection answers most inputs in microseconds;
+        # only ambiguous text is sent to Gemini
+        identifier = _get_language_identifier()
+        if identifier is not None:
+            local = identifier.FindLanguage(text=text)
+            if local.is_reliable and local.probability >= LOCAL_DETECT_MIN_PROBABILITY:
+                return {
+                    "text": text,
+                    "language_code": local.language,
+                    "confidence": local.probability,
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+        
         try:
-            prompt = (
-                "Detect the language of the following text.\n"
-                "Reply with ONLY a JSON object in this exact format: "
-                '{\"language_code\": \"<ISO 639-1 code>\", \"confidence\": <0.0-1.0>}\n'
-                "Do not include any other text.\n\n"
-                f"Text:\n{text}"
-            )
-
-            response = self.model.generate_content(prompt)
-            raw = response.text.strip()
-
-            # Strip markdown fences if present
-            if raw.startswith("```"):
-                lines = raw.split("\n")
-                # Remove first and last lines (fences)
-                lines = [l for l in lines if not l.strip().startswith("```")]
-                raw = "\n".join(lines).strip()
+            prompt = _DETECT_PROMPT_PREFIX + text
 
-            parsed = json.loads(raw)
+            response = await self._generate(prompt, generation_config=self._detect_config)
+            parsed = json.loads(response.text)
             
-            return {
+            result = {
                 "text": text,
                 "language_code": parsed.get("language_code"),
                 "confidence": parsed.get("confidence", 0.9),
                 "timestamp": datetime.utcnow().isoformat()
             }
             
+            if result["language_code"]:
+                self._detect_cache[digest] = result
+                if len(self._detect_cache) > DETECT_CACHE_SIZE:
+                    self._detect_cache.popitem(last=False)
+            return result
+            
         except Exception as e:
             logger.error(f"Language detection failed: {e}")
             return {
@@ -401,12 +1340,20 @@ class TranslationService:
         Returns:
             Dict containing service statistics
         """
-        gemini_model = getattr(self.settings, "gemini_model", "gemini-2.0-flash")
+        stats = self.stats.copy()
+        stats["last_translation_time"] = self.iso(stats["last_translation_time"])
+        stats["p50_latency_ms"] = stats["p99_latency_ms"] = None
+        if len(self._recent_latencies) >= 2:
+            percentiles = statistics.quantiles(self._recent_latencies, n=100, method="inclusive")
+            stats["p50_latency_ms"] = round(percentiles[49], 2)
+            stats["p99_latency_ms"] = round(percentiles[98], 2)
+        
         return {
             "is_initialized": self.is_initialized,
-            "stats": self.stats.copy(),
+            "is_verified": self._verified,
+            "stats": stats,
             "settings": {
-                "model": gemini_model,
+                "model": self.model_name,
                 "default_source_language": self.settings.default_source_language,
                 "default_target_language": self.settings.default_target_language,
             }
@@ -419,9 +1366,26 @@ class TranslationService:
             "successful_translations": 0,
             "failed_translations": 0,
             "average_latency_ms": 0,
-            "last_translation_time": None
+            "last_translation_time": None,
+            "cache_hits": 0,
+            "suppressed_failures": 0
         }
+        self._latency_count = 0
+        self._recent_latencies.clear()
         logger.info("Translation statistics reset")
+    
+    async def clear_cache(self) -> None:
+        """Drop all cached translations and detections, including the SQLite tier"""
+        self._cache.clear()
+        self._detect_cache.clear()
+        self._neg_cache.clear()
+        if self._db is not None:
+            await asyncio.to_thread(self._db_clear)
+        logger.info("Translation cache cleared")
+    
+    def _db_clear(self) -> None:
+        with self._db_lock:
+            self._db.execute("DELETE FROM tm")
 
 
 # Global translation service instance
@@ -16,13 +16,17 @@ Before using this service, make sure you have:
 4. Installed required dependencies
 """
 
+import asyncio
 import os
 import tempfile
 import time
 import subprocess
 import sys
 import json
+import threading
 import logging
+import hashlib
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime
@@ -40,6 +44,9 @@ except ImportError as e:
 # Logger
 logger = logging.getLogger(__name__)
 
+# Number of synthesized audio files kept for reuse
+AUDIO_CACHE_SIZE = 256
+
 
 def find_credentials_file():
     """Find the credentials.json file in common locations"""
@@ -135,6 +142,13 @@ def setup_authentication():
     print("=" * 60)
 
 
+def _audio_temp_dir() -> str:
+    """Directory for synthesized audio, preferring RAM-backed /dev/shm when writable"""
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return tempfile.gettempdir()
+
+
 class TTSService:
     """Text-to-Speech Service using Google Cloud Text-to-Speech"""
     
@@ -148,13 +162,20 @@ class TTSService:
         """
         self.language_code = language_code
         self.voice_gender = getattr(texttospeech.SsmlVoiceGender, voice_gender)
-        self.temp_dir = tempfile.gettempdir()
+        self.temp_dir = _audio_temp_dir()
         self.is_initialized = False
         self.client = None
+        self._credentials = None
+        self._async_client = None
+        self._async_client_loop = None
+        # Audio cache: key -> path of an already written file, LRU order
+        self._audio_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._audio_cache_lock = threading.Lock()
         self.stats = {
             'total_requests': 0,
             'successful_requests': 0,
             'failed_requests': 0,
+            'cache_hits': 0,
             'total_characters': 0,
             'last_request_time': None
         }
@@ -172,6 +193,7 @@ class TTSService:
             )
             
             self.client = texttospeech.TextToSpeechClient(credentials=credentials)
+            self._credentials = credentials
             self.is_initialized = True
             logger.info(f"Google Cloud TTS client initialized successfully using: {credentials_path}")
         except Exception as e:
@@ -201,52 +223,69 @@ class TTSService:
         Returns:
             Path to the generated audio file
         """
-        if not self.is_initialized:
-            raise RuntimeError("TTS Service not initialized")
+        cache_key = None
+        if filename is None:
+            cache_key = self._audio_cache_key(text)
+            cached = self._audio_cache_get(cache_key)
+            if cached:
+                return cached
+            filename = f"tts_{cache_key.hex()}.mp3"
         
-        # Update statistics
-        self.stats['total_requests'] += 1
-        self.stats['total_characters'] += len(text)
-        self.stats['last_request_time'] = datetime.utcnow().isoformat()
+        request = self._start_request(text)
         
         try:
-            logger.info(f"Converting text to speech: '{text[:50]}...'")
-            
-            # Set the text input to be synthesized
-            synthesis_input = texttospeech.SynthesisInput(text=text)
-            
-            # Build the voice request, select the language code and the SSML voice gender
-            voice = texttospeech.VoiceSelectionParams(
-                language_code=self.language_code,
-                ssml_gender=self.voice_gender
-            )
-            
-            # Select the type of audio file you want returned
-            audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3
-            )
-            
             # Perform the text-to-speech request on the text input with the selected
             # voice parameters and audio file type
-            response = self.client.synthesize_speech(
-                input=synthesis_input, voice=voice, audio_config=audio_config
-            )
+            response = self.client.synthesize_speech(**request)
             
-            # Generate filename if not provided
-            if filename is None:
-                timestamp = int(time.time())
-                filename = f"tts_output_{timestamp}.mp3"
+            filepath = self._output_path(filename)
+            self._write_audio(filepath, response.audio_content)
+            if cache_key is not None:
+                self._audio_cache_put(cache_key, filepath)
             
-            # Save to temporary directory
-            filepath = os.path.join(self.temp_dir, filename)
+            self.stats['successful_requests'] += 1
+            logger.info("Audio saved to: %s", filepath)
+            return filepath
             
-            # The response's audio_content is binary
-            with open(filepath, "wb") as out:
-                # Write the response to the output file
-                out.write(response.audio_content)
+        except Exception as e:
+            self.stats['failed_requests'] += 1
+            logger.error(f"Error converting text to speech: {e}")
+            raise
+    
+    async def text_to_speech_async(self, text: str, filename: Optional[str] = None) -> str:
+        """
+        Coroutine version of text_to_speech for use from the event loop
+        
+        Synthesis goes through the async gRPC client, so concurrent requests
+        share one multiplexed channel; only the file write uses a worker thread.
+        
+        Args:
+            text: Text to convert to speech
+            filename: Optional filename for the audio file
+            
+        Returns:
+            Path to the generated audio file
+        """
+        cache_key = None
+        if filename is None:
+            cache_key = self._audio_cache_key(text)
+            cached = self._audio_cache_get(cache_key)
+            if cached:
+                return cached
+            filename = f"tts_{cache_key.hex()}.mp3"
+        
+        request = self._start_request(text)
+        
+        try:
+            response = await self._get_async_client().synthesize_speech(**request)
+            
+            filepath = self._output_path(filename)
+            await asyncio.to_thread(self._write_audio, filepath, response.audio_content)
+            if cache_key is not None:
+                self._audio_cache_put(cache_key, filepath)
             
             self.stats['successful_requests'] += 1
-            logger.info(f"Audio saved to: {filepath}")
+            logger.info("Audio saved to: %s", filepath)
             return filepath
             
         except Exception as e:
@@ -254,6 +293,97 @@ class TTSService:
             logger.error(f"Error converting text to speech: {e}")
             raise
     
+    def _audio_cache_key(self, text: str) -> bytes:
+        """Cache key for text spoken with the current voice settings"""
+        return hashlib.blake2b(
+            f"{self.language_code}|{self.voice_gender}|{text}".encode("utf-8"),
+            digest_size=16
+        ).digest()
+    
+    def _audio_cache_get(self, key: bytes) -> Optional[str]:
+        """Path of previously synthesized audio, if the file is still on disk"""
+        with self._audio_cache_lock:
+            filepath = self._audio_cache.get(key)
+            if filepath is None:
+                return None
+            if not os.path.exists(filepath):
+                # Removed by a caller after playback
+                del self._audio_cache[key]
+                return None
+            self._audio_cache.move_to_end(key)
+            self.stats['cache_hits'] += 1
+        
+        logger.info("Reusing cached audio: %s", filepath)
+        return filepath
+    
+    def _audio_cache_put(self, key: bytes, filepath: str) -> None:
+        """Remember a written audio file, deleting the least recently used beyond AUDIO_CACHE_SIZE"""
+        evicted = []
+        with self._audio_cache_lock:
+            self._audio_cache[key] = filepath
+            self._audio_cache.move_to_end(key)
+            while len(self._audio_cache) > AUDIO_CACHE_SIZE:
+                evicted.append(self._audio_cache.popitem(last=False)[1])
+        
+        for path in evicted:
+            # Also drop any WAV the playback path converted from it
+            for stale in (path, os.path.splitext(path)[0] + '.wav'):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+    
+    def is_cached_audio(self, filepath: str) -> bool:
+        """Whether a file is owned by the audio cache and should not be deleted by callers"""
+        with self._audio_cache_lock:
+            return filepath in self._audio_cache.values()
+    
+    def _get_async_client(self) -> "texttospeech.TextToSpeechAsyncClient":
+        """Async client bound to the running event loop, created on first use"""
+        # grpc.aio channels belong to the loop they were created on
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = texttospeech.TextToSpeechAsyncClient(credentials=self._credentials)
+            self._async_client_loop = loop
+        return self._async_client
+    
+    def _start_request(self, text: str) -> Dict[str, Any]:
+        """Count a synthesis request and build its arguments from the current voice settings"""
+        if not self.is_initialized:
+            raise RuntimeError("TTS Service not initialized")
+        
+        # Update statistics
+        self.stats['total_requests'] += 1
+        self.stats['total_characters'] += len(text)
+        self.stats['last_request_time'] = time.time()
+        
+        logger.info("Converting text to speech: '%.50s'", text)
+        
+        return {
+            # Set the text input to be synthesized
+            'input': texttospeech.SynthesisInput(text=text),
+            # Build the voice request, select the language code and the SSML voice gender
+            'voice': texttospeech.VoiceSelectionParams(
+                language_code=self.language_code,
+                ssml_gender=self.voice_gender
+            ),
+            # Select the type of audio file you want returned
+            'audio_config': texttospeech.AudioConfig(
+                audio_encoding=texttospeech.AudioEncoding.MP3
+            )
+        }
+    
+    def _output_path(self, filename: str) -> str:
+        """Path in the temporary directory for a new audio file"""
+        return os.path.join(self.temp_dir, filename)
+    
+    @staticmethod
+    def _write_audio(filepath: str, audio_content: bytes) -> None:
+        """Write synthesized audio to disk"""
+        # The response's audio_content is binary
+        with open(filepath, "wb") as out:
+            out.write(audio_content)
+    
     def play_audio(self, filepath: str) -> None:
         """
         Play audio file using pygame
@@ -262,7 +392,7 @@ class TTSService:
             filepath: Path to the audio file to play
         """
         try:
-            logger.info(f"Playing audio: {filepath}")
+            logger.info("Playing audio: %s", filepath)
             
             # Load and play the audio file
             pygame.mixer.music.load(filepath)
@@ -293,11 +423,11 @@ class TTSService:
             # Play the audio
             self.play_audio(audio_file)
             
-            # Clean up temporary file if requested
-            if cleanup:
+            # Clean up temporary file if requested; cached audio is kept for reuse
+            if cleanup and not self.is_cached_audio(audio_file):
                 try:
                     os.remove(audio_file)
-                    logger.info(f"Cleaned up temporary file: {audio_file}")
+                    logger.info("Cleaned up temporary file: %s", audio_file)
                 except OSError as e:
                     logger.warning(f"Could not delete temporary file {audio_file}: {e}")
                     
@@ -307,11 +437,16 @@ class TTSService:
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get service statistics"""
+        stats = self.stats.copy()
+        # Stored as epoch seconds and only formatted here
+        if stats['last_request_time'] is not None:
+            stats['last_request_time'] = datetime.utcfromtimestamp(stats['last_request_time']).isoformat()
+        
         return {
             'is_initialized': self.is_initialized,
             'language_code': self.language_code,
             'voice_gender': self.voice_gender.value if hasattr(self.voice_gender, 'value') else str(self.voice_gender),
-            'stats': self.stats.copy()
+            'stats': stats
         }
     
     def reset_statistics(self) -> None:
@@ -320,6 +455,7 @@ class TTSService:
             'total_requests': 0,
             'successful_requests': 0,
             'failed_requests': 0,
+            'cache_hits': 0,
             'total_characters': 0,
             'last_request_time': None
         }
@@ -328,7 +464,7 @@ class TTSService:
     def set_language(self, language_code: str) -> None:
         """Set the language code for TTS"""
         self.language_code = language_code
-        logger.info(f"TTS language set to: {language_code}")
+        logger.info("TTS language set to: %s", language_code)
     
     def set_voice_gender(self, voice_gender: str) -> None:
         """Set the voice gender for TTS"""
@@ -347,12 +483,16 @@ class TTSService:
 
 # Global TTS service instance
 _tts_service = None
+_tts_service_lock = threading.Lock()
 
 def get_tts_service() -> TTSService:
     """Get the global TTS service instance"""
     global _tts_service
     if _tts_service is None:
-        _tts_service = TTSService()
+        # The TTS queue thread and request handlers can both get here first
+        with _tts_service_lock:
+            if _tts_service is None:
+                _tts_service = TTSService()
     return _tts_service
 
 def initialize_tts_service(language_code: str = 'en-US', voice_gender: str = 'NEUTRAL') -> bool:
@@ -5,17 +5,70 @@ Prevents overlapping speech by queuing TTS requests and playing them sequentiall
 
 import queue
 import threading
+import hashlib
+import itertools
+from collections import deque
 import time
 import logging
 import os
 import subprocess
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+import wave
+
+try:
+    from mutagen.mp3 import MP3
+except ImportError:
+    MP3 = None
 
 logger = logging.getLogger(__name__)
 
+# Queued phrases arriving within this window are synthesized as one request
+COALESCE_WINDOW = 0.05
+# Keeps merged text well under the Cloud TTS 5000-byte input limit
+MAX_COALESCED_CHARS = 1500
+
+
+def _preview(text: str, limit: int = 50) -> str:
+    """Text shortened for logs and stats; short text is returned as is"""
+    if len(text) <= limit:
+        return text
+    return text[:limit] + '...'
+
+
+def _audio_duration(audio_file: str) -> Optional[float]:
+    """
+    Playback length of an audio file in seconds, or None if it cannot be read
+    
+    WAV headers are parsed in-process and MP3s are read with mutagen when it is
+    installed; ffprobe is only spawned for anything else.
+    """
+    try:
+        if audio_file.endswith('.wav'):
+            with wave.open(audio_file, 'rb') as wav:
+                return wav.getnframes() / wav.getframerate()
+        
+        if MP3 is not None and audio_file.endswith('.mp3'):
+            return MP3(audio_file).info.length
+        
+        # Get audio duration using ffprobe
+        duration_cmd = [
+            'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
+            '-of', 'csv=p=0', audio_file
+        ]
+        
+        result = subprocess.run(duration_cmd, capture_output=True, text=True, timeout=10)
+        if result.returncode == 0:
+            return float(result.stdout.strip())
+        
+    except Exception as e:
+        logger.warning(f"Error determining audio duration: {e}")
+    
+    return None
+
 
 class TTSStatus(Enum):
     """Status of TTS processing"""
@@ -59,6 +112,16 @@ class TTSQueue:
         self.is_playing = False
         self.current_request: Optional[TTSRequest] = None
         self.processing_thread = None
+        # Synthesizes the next phrase while the current one plays
+        self._generation_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-generate")
+        # Request taken from the queue while coalescing that could not be merged
+        self._held_request: Optional[TTSRequest] = None
+        # Set by stop_processing to cut short waits on playback
+        self._stop_event = threading.Event()
+        # Sequence for request IDs, unique within the process
+        self._request_ids = itertools.count(1)
+        # Keys of recently queued phrases, used to skip the pending scan for new text
+        self._recent_keys = deque(maxlen=16)
         
         # Callbacks for external services
         self.tts_callback: Optional[Callable] = None
@@ -69,7 +132,8 @@ class TTSQueue:
             'total_requests': 0,
             'completed_requests': 0,
             'failed_requests': 0,
-            'queue_size': 0,
+            'coalesced_requests': 0,
+            'duplicate_requests': 0,
             'currently_playing': False,
             'last_processed': None
         }
@@ -109,7 +173,17 @@ class TTSQueue:
             logger.warning("Empty text provided for TTS, skipping")
             return None
         
-        request_id = f"tts_{int(time.time() * 1000)}_{len(text)}"
+        # A phrase that is already waiting or playing is not queued twice
+        key = hashlib.blake2b(f"{language_code}|{text.strip()}".encode("utf-8"), digest_size=8).digest()
+        if key in self._recent_keys:
+            pending_id = self._find_pending(text.strip(), language_code)
+            if pending_id:
+                logger.debug("Duplicate TTS request for '%.50s', already queued as %s", text, pending_id)
+                with self._stats_lock:
+                    self.stats['duplicate_requests'] += 1
+                return pending_id
+        
+        request_id = f"tts_{next(self._request_ids)}"
         request = TTSRequest(
             id=request_id,
             text=text.strip(),
@@ -121,12 +195,12 @@ class TTSQueue:
         
         try:
             self.tts_queue.put(request, timeout=1.0)
+            self._recent_keys.append(key)
             
             with self._stats_lock:
                 self.stats['total_requests'] += 1
-                self.stats['queue_size'] = self.tts_queue.qsize()
             
-            logger.info(f"Added TTS request to queue: '{text[:50]}...' (ID: {request_id})")
+            logger.info("Added TTS request to queue: '%.50s' (ID: %s)", text, request_id)
             
             # Start processing if not already running
             if not self.is_processing:
@@ -135,11 +209,23 @@ class TTSQueue:
             return request_id
             
         except queue.Full:
-            logger.warning(f"TTS queue full, dropping request: '{text[:50]}...'")
+            logger.warning(f"TTS queue full, dropping request: '{_preview(text)}'")
             with self._stats_lock:
                 self.stats['failed_requests'] += 1
             return None
     
+    def _find_pending(self, text: str, language_code: str) -> Optional[str]:
+        """ID of a queued or playing request with the same text and language"""
+        with self._processing_lock:
+            active = [self.current_request, self._held_request]
+        with self.tts_queue.mutex:
+            active.extend(self.tts_queue.queue)
+        
+        for request in active:
+            if isinstance(request, TTSRequest) and request.text == text and request.language_code == language_code:
+                return request.id
+        return None
+    
     def start_processing(self):
         """Start the TTS processing thread"""
         if self.is_processing:
@@ -147,61 +233,103 @@ class TTSQueue:
             return
         
         self.is_processing = True
-        self.processing_thread = threading.Thread(target=self._process_requests, daemon=True)
+        # A fresh event per worker, so a worker still finishing after a stop
+        # is not revived by this restart
+        self._stop_event = threading.Event()
+        self.processing_thread = threading.Thread(
+            target=self._process_requests, args=(self._stop_event,), daemon=True
+        )
         self.processing_thread.start()
         logger.info("Started TTS processing thread")
     
     def stop_processing(self):
         """Stop the TTS processing thread"""
         self.is_processing = False
+        self._stop_event.set()
         
         if self.processing_thread and self.processing_thread.is_alive():
+            # Wake the worker if it is blocked waiting for a request; its own
+            # stop event is the sentinel, so later workers can tell it apart
+            stop = self._stop_event
+            try:
+                self.tts_queue.put_nowait(stop)
+            except queue.Full:
+                pass  # The worker has requests to take and checks the event first
+            
             self.processing_thread.join(timeout=2.0)
+            
+            # A worker that left through its event check never took the sentinel
+            if not self.processing_thread.is_alive():
+                with self.tts_queue.mutex:
+                    if stop in self.tts_queue.queue:
+                        self.tts_queue.queue.remove(stop)
+                        self.tts_queue.unfinished_tasks -= 1
+                        self.tts_queue.not_full.notify()
         
         logger.info("Stopped TTS processing thread")
     
-    def _process_requests(self):
+    def _process_requests(self, stop: threading.Event):
         """Main processing thread - handles TTS requests sequentially"""
-        while self.is_processing:
+        # Generation of the next phrase, started while the current one plays
+        prefetch = None
+        
+        while not stop.is_set():
             try:
-                # Get next request from queue (this blocks until one is available)
-                request = self.tts_queue.get(timeout=1.0)
+                prepared = prefetch.result() if prefetch else None
+                prefetch = None
                 
-                with self._processing_lock:
-                    self.current_request = request
-                    self.is_playing = True
-                
-                logger.info(f"Processing TTS request: '{request.text[:50]}...'")
-                
-                try:
+                if prepared is None:
+                    # Get next request from queue (this blocks until one is available)
+                    request = self._next_request(stop)
+                    if request is None:
+                        # Shutdown sentinel from stop_processing
+                        break
+                    request = self._coalesce(request)
+                    
+                    with self._processing_lock:
+                        self.current_request = request
+                        self.is_playing = True
+                    
+                    logger.info("Processing TTS request: '%.50s'", request.text)
+                    
                     # Generate TTS audio
                     request.status = TTSStatus.GENERATING
                     audio_file = self._generate_tts(request)
+                else:
+                    request, audio_file = prepared
                     
+                    with self._processing_lock:
+                        self.current_request = request
+                        self.is_playing = True
+                
+                try:
                     if audio_file:
                         request.audio_file = audio_file
                         request.status = TTSStatus.PLAYING
                         
+                        # Overlap synthesis of the next phrase with this playback
+                        prefetch = self._generation_executor.submit(self._prepare_next)
+                        
                         # Play audio and wait for completion
                         self._play_audio(request)
                         
                         request.status = TTSStatus.COMPLETED
-                        logger.info(f"TTS completed: '{request.text[:50]}...'")
+                        logger.info("TTS completed: '%.50s'", request.text)
                         
                         # Update statistics
                         with self._stats_lock:
                             self.stats['completed_requests'] += 1
-                            self.stats['last_processed'] = datetime.utcnow().isoformat()
+                            self.stats['last_processed'] = time.time()
                     else:
                         raise Exception("TTS generation failed")
                         
                 except Exception as e:
-                    logger.error(f"TTS failed for '{request.text[:50]}...': {e}")
+                    logger.error(f"TTS failed for '{_preview(request.text)}': {e}")
                     request.status = TTSStatus.FAILED
                     request.retry_count += 1
                     
                     if request.retry_count < request.max_retries:
-                        logger.info(f"Retrying TTS (attempt {request.retry_count + 1})")
+                        logger.info("Retrying TTS (attempt %d)", request.retry_count + 1)
                         # Put back in queue for retry
                         self.tts_queue.put(request, timeout=1.0)
                     else:
@@ -215,16 +343,106 @@ class TTSQueue:
                     
                     # Mark task as done
                     self.tts_queue.task_done()
-                    
-                    # Update queue size
-                    with self._stats_lock:
-                        self.stats['queue_size'] = self.tts_queue.qsize()
                 
-            except queue.Empty:
-                continue
             except Exception as e:
                 logger.error(f"Error in TTS processing: {e}")
-                time.sleep(1.0)
+                stop.wait(1.0)
+        
+        # A phrase generated ahead of a stop is played first after a restart
+        prepared = prefetch.result() if prefetch else None
+        if prepared is not None:
+            with self._processing_lock:
+                self._held_request = prepared[0]
+    
+    def _prepare_next(self) -> Optional[Tuple[TTSRequest, Optional[str]]]:
+        """
+        Take the next request without blocking and synthesize it
+        
+        Runs on the generation executor while the worker plays the previous
+        phrase; the worker does not touch the queue until this finishes.
+        """
+        with self._processing_lock:
+            request, self._held_request = self._held_request, None
+        while request is None:
+            try:
+                request = self.tts_queue.get_nowait()
+            except queue.Empty:
+                return None
+            if isinstance(request, threading.Event):
+                # Shutdown sentinel; the worker loop sees its stop event and exits
+                self.tts_queue.task_done()
+                request = None
+        
+        request = self._coalesce(request)
+        logger.info("Generating next TTS request during playback: '%.50s'", request.text)
+        request.status = TTSStatus.GENERATING
+        return request, self._generate_tts(request)
+    
+    def _next_request(self, stop: threading.Event) -> Optional[TTSRequest]:
+        """
+        Take the held request if there is one, otherwise block on the queue
+        
+        Returns None once stop is set or this worker's sentinel arrives.
+        """
+        with self._processing_lock:
+            request, self._held_request = self._held_request, None
+        if request is not None:
+            return request
+        if stop.is_set():
+            # The prefetch may already have taken this worker's sentinel
+            return None
+        while True:
+            item = self.tts_queue.get()
+            if not isinstance(item, threading.Event):
+                return item
+            self.tts_queue.task_done()
+            if item is stop:
+                return None
+            # Sentinel left behind by an earlier worker
+    
+    def _coalesce(self, request: TTSRequest) -> TTSRequest:
+        """
+        Merge adjacent queued phrases for the same voice and speakers into one request
+        
+        Playback is sequential anyway, so one synthesis, conversion and playback
+        for the merged text replaces a round-trip per phrase. Waits at most
+        COALESCE_WINDOW for followers; the first phrase that cannot be merged is
+        held and processed next.
+        """
+        if request.retry_count:
+            return request
+        
+        deadline = time.monotonic() + COALESCE_WINDOW
+        while len(request.text) < MAX_COALESCED_CHARS:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                follower = self.tts_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            
+            if isinstance(follower, threading.Event):
+                # Shutdown sentinel; the worker loop sees its stop event and exits
+                self.tts_queue.task_done()
+                break
+            
+            if (follower.retry_count
+                    or follower.language_code != request.language_code
+                    or follower.speaker1_config != request.speaker1_config
+                    or follower.speaker2_config != request.speaker2_config
+                    or len(request.text) + len(follower.text) >= MAX_COALESCED_CHARS):
+                with self._processing_lock:
+                    self._held_request = follower
+                break
+            
+            request.text = f"{request.text} {follower.text}"
+            self.tts_queue.task_done()
+            with self._stats_lock:
+                self.stats['coalesced_requests'] += 1
+            logger.info("Coalesced TTS request %s into %s", follower.id, request.id)
+        
+        return request
     
     def _generate_tts(self, request: TTSRequest) -> Optional[str]:
         """Generate TTS audio file"""
@@ -240,7 +458,7 @@ class TTSQueue:
             )
             
             if audio_file and os.path.exists(audio_file):
-                logger.info(f"Generated TTS audio: {audio_file}")
+                logger.info("Generated TTS audio: %s", audio_file)
                 return audio_file
             else:
                 logger.error(f"TTS callback returned invalid file: {audio_file}")
@@ -273,38 +491,29 @@ class TTSQueue:
     
     def _wait_for_audio_completion(self, audio_file: str):
         """Wait for audio file to finish playing"""
-        try:
-            # Get audio duration using ffprobe
-            duration_cmd = [
-                'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
-                '-of', 'csv=p=0', audio_file
-            ]
+        duration = _audio_duration(audio_file)
+        if duration is not None:
+            logger.info("Audio duration: %.2f seconds", duration)
             
-            result = subprocess.run(duration_cmd, capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                duration = float(result.stdout.strip())
-                logger.info(f"Audio duration: {duration:.2f} seconds")
-                
-                # Wait for the duration plus a small buffer
-                time.sleep(duration + 0.5)
-            else:
-                # Fallback: wait a reasonable amount of time
-                logger.warning("Could not determine audio duration, waiting 3 seconds")
-                time.sleep(3.0)
-                
-        except Exception as e:
-            logger.warning(f"Error determining audio duration: {e}, waiting 3 seconds")
-            time.sleep(3.0)
+            # Wait for the duration plus a small buffer
+            self._stop_event.wait(duration + 0.5)
+        else:
+            # Fallback: wait a reasonable amount of time
+            logger.warning("Could not determine audio duration, waiting 3 seconds")
+            self._stop_event.wait(3.0)
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get TTS queue statistics"""
         with self._stats_lock:
             stats = self.stats.copy()
+            # Stored as epoch seconds and only formatted here
+            if stats['last_processed'] is not None:
+                stats['last_processed'] = datetime.utcfromtimestamp(stats['last_processed']).isoformat()
             stats['queue_size'] = self.tts_queue.qsize()
             stats['currently_playing'] = self.is_playing
             stats['current_request'] = {
                 'id': self.current_request.id if self.current_request else None,
-                'text': self.current_request.text[:50] + '...' if self.current_request else None,
+                'text': _preview(self.current_request.text) if self.current_request else None,
                 'status': self.current_request.status.value if self.current_request else None
             }
         
@@ -313,22 +522,30 @@ class TTSQueue:
     def clear_queue(self):
         """Clear all queued requests"""
         with self._processing_lock:
+            if self._held_request is not None:
+                self._held_request = None
+                self.tts_queue.task_done()
+            
             # Clear the queue
+            sentinels = []
             while not self.tts_queue.empty():
                 try:
-                    self.tts_queue.get_nowait()
+                    item = self.tts_queue.get_nowait()
                     self.tts_queue.task_done()
                 except queue.Empty:
                     break
+                if isinstance(item, threading.Event):
+                    sentinels.append(item)
             
-            with self._stats_lock:
-                self.stats['queue_size'] = 0
+            # Keep pending shutdown sentinels so a stopping worker still exits
+            for sentinel in sentinels:
+                self.tts_queue.put_nowait(sentinel)
         
         logger.info("TTS queue cleared")
     
     def is_busy(self) -> bool:
         """Check if TTS is currently processing or playing"""
-        return self.is_playing or not self.tts_queue.empty()
+        return self.is_playing or self._held_request is not None or not self.tts_queue.empty()
 
 
 # Global instance
@@ -361,17 +578,19 @@ def initialize_tts_queue() -> bool:
         def audio_callback(audio_file, speaker1_config, speaker2_config):
             audio_service = get_audio_service()
             if audio_service.speaker1_assignment and audio_service.speaker2_assignment:
-                # Convert MP3 to WAV if needed
+                # Convert MP3 to WAV if needed; cached phrases reuse their earlier conversion
                 wav_file = audio_file
                 if audio_file.endswith('.mp3'):
                     wav_file = audio_file.replace('.mp3', '.wav')
-                    try:
-                        subprocess.run([
-                            'ffmpeg', '-i', audio_file, '-acodec', 'pcm_s16le', 
-                            '-ar', '44100', '-ac', '2', '-y', wav_file
-                        ], check=True, capture_output=True)
-                    except subprocess.CalledProcessError:
-                        wav_file = audio_file  # Use original if conversion fails
+                    if not (os.path.exists(wav_file)
+                            and os.path.getmtime(wav_file) >= os.path.getmtime(audio_file)):
+                        try:
+                            subprocess.run([
+                                'ffmpeg', '-i', audio_file, '-acodec', 'pcm_s16le', 
+                                '-ar', '44100', '-ac', '2', '-y', wav_file
+                            ], check=True, capture_output=True)
+                        except subprocess.CalledProcessError:
+                            wav_file = audio_file  # Use original if conversion fails
                 
                 # Start dual playback
                 audio_service._start_dual_playback(wav_file, wav_file)
@@ -7,10 +7,18 @@ Demonstrates how to use the Speech-to-Text API endpoints
 import asyncio
 import json
 import base64
+import mmap
 import websockets
-import requests
+import httpx
 from typing import Dict, Any
 
+try:
+    # Faster parsing for the per-message streaming loops; its JSONDecodeError
+    # subclasses json.JSONDecodeError
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 
 class STTClient:
     """Client for interacting with the STT API"""
@@ -18,47 +26,77 @@ class STTClient:
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
         self.ws_url = base_url.replace("http", "ws")
+        # One pooled connection for every HTTP call instead of a new one per request
+        self._http = httpx.AsyncClient(base_url=base_url, timeout=60.0)
+    
+    async def __aenter__(self) -> "STTClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
     
-    def get_supported_languages(self) -> Dict[str, Any]:
+    async def close(self) -> None:
+        """Close the pooled HTTP connection"""
+        await self._http.aclose()
+    
+    async def get_supported_languages(self) -> Dict[str, Any]:
         """Get list of supported languages"""
-        response = requests.get(f"{self.base_url}/stt/languages")
+        response = await self._http.get("/stt/languages")
         return response.json()
     
-    def get_status(self) -> Dict[str, Any]:
+    async def get_status(self) -> Dict[str, Any]:
         """Get STT service status"""
-        response = requests.get(f"{self.base_url}/stt/status")
+        response = await self._http.get("/stt/status")
         return response.json()
     
-    def transcribe_file(self, audio_file_path: str, language_code: str = "en-US") -> Dict[str, Any]:
+    async def transcribe_file(self, audio_file_path: str, language_code: str = "en-US") -> Dict[str, Any]:
         """Transcribe an audio file"""
-        # Read and encode audio file
+        # Encode straight from a read-only mapping of the file, so no raw copy is held
         with open(audio_file_path, "rb") as f:
-            audio_data = f.read()
-        
-        audio_b64 = base64.b64encode(audio_data).decode('utf-8')
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as audio_data:
+                audio_b64 = base64.b64encode(audio_data)
         
-        payload = {
-            "audio_data": audio_b64,
-            "language_code": language_code
-        }
+        # Assemble the JSON body around the base64 bytes (which need no escaping)
+        # instead of re-encoding it as a str and then as bytes
+        body = b"".join([
+            b'{"audio_data": "', audio_b64,
+            b'", "language_code": ', json.dumps(language_code).encode('utf-8'), b'}'
+        ])
+        del audio_b64
         
-        response = requests.post(f"{self.base_url}/stt/transcribe-file", json=payload)
+        response = await self._http.post(
+            "/stt/transcribe-file",
+            content=body,
+            headers={"Content-Type": "application/json"}
+        )
         return response.json()
     
-    def start_streaming(self, language_code: str = "en-US"):
+    async def start_streaming(self, language_code: str = "en-US"):
         """Start streaming transcription via HTTP"""
-        response = requests.get(f"{self.base_url}/stt/stream", params={"language_code": language_code}, stream=True)
-        
-        for line in response.iter_lines():
-            if line:
-                line_str = line.decode('utf-8')
-                if line_str.startswith('data: '):
-                    data_str = line_str[6:]  # Remove 'data: ' prefix
-                    try:
-                        data = json.loads(data_str)
-                        print(f"📝 {data['type'].upper()}: {data['transcript']} (confidence: {data.get('confidence', 0):.2f})")
-                    except json.JSONDecodeError:
-                        print(f"Raw data: {data_str}")
+        async with self._http.stream(
+            "GET", "/stt/stream", params={"language_code": language_code}, timeout=None
+        ) as response:
+            async for data_bytes in self._iter_sse_data(response):
+                try:
+                    data = json_loads(data_bytes)
+                    print(f"📝 {data['type'].upper()}: {data['transcript']} (confidence: {data.get('confidence', 0):.2f})")
+                except json.JSONDecodeError:
+                    print(f"Raw data: {data_bytes.decode('utf-8', 'replace')}")
+    
+    @staticmethod
+    async def _iter_sse_data(response):
+        """Yield the payload of each SSE 'data: ' line as bytes"""
+        # Split chunks with one growing buffer in a single linear pass
+        buffer = bytearray()
+        async for chunk in response.aiter_bytes():
+            buffer.extend(chunk)
+            start = 0
+            while (end := buffer.find(b"\n", start)) != -1:
+                line = buffer[start:end].rstrip(b"\r")
+                start = end + 1
+                if line.startswith(b"data: "):
+                    yield bytes(line[6:])  # Remove 'data: ' prefix
+            del buffer[:start]
     
     async def start_websocket_streaming(self, language_code: str = "en-US"):
         """Start streaming transcription via WebSocket"""
@@ -70,7 +108,7 @@ class STTClient:
                 
                 # Start streaming
                 async for message in websocket:
-                    data = json.loads(message)
+                    data = json_loads(message)
                     
                     if data.get("type") == "connected":
                         print(f"✅ {data['message']}")
@@ -87,14 +125,14 @@ class STTClient:
         except Exception as e:
             print(f"❌ WebSocket error: {e}")
     
-    def stop_streaming(self) -> Dict[str, Any]:
+    async def stop_streaming(self) -> Dict[str, Any]:
         """Stop the current streaming session"""
-        response = requests.post(f"{self.base_url}/stt/stop")
+        response = await self._http.post("/stt/stop")
         return response.json()
     
-    def reset_statistics(self) -> Dict[str, Any]:
+    async def reset_statistics(self) -> Dict[str, Any]:
         """Reset STT service statistics"""
-        response = requests.post(f"{self.base_url}/stt/reset-stats")
+        response = await self._http.post("/stt/reset-stats")
         return response.json()
 
 
@@ -103,16 +141,20 @@ async def main():
     print("🎤 STT Client Example")
     print("=" * 50)
     
-    client = STTClient()
-    
+    async with STTClient() as client:
+        await run_menu(client)
+
+
+async def run_menu(client: STTClient):
+    """Query the service and run the selected example"""
     # Check service status
     print("\n1. Checking STT service status...")
-    status = client.get_status()
+    status = await client.get_status()
     print(f"Status: {status}")
     
     # Get supported languages
     print("\n2. Getting supported languages...")
-    languages = client.get_supported_languages()
+    languages = await client.get_supported_languages()
     print(f"Supported languages: {len(languages['data']['languages'])}")
     
     # Example usage menu
@@ -131,7 +173,7 @@ async def main():
         if audio_file:
             language = input("Enter language code (default: en-US): ").strip() or "en-US"
             print(f"\nTranscribing {audio_file}...")
-            result = client.transcribe_file(audio_file, language)
+            result = await client.transcribe_file(audio_file, language)
             print(f"Result: {json.dumps(result, indent=2)}")
     
     elif choice == "2":
@@ -140,10 +182,10 @@ async def main():
         print(f"\nStarting HTTP streaming for language: {language}")
         print("Speak into your microphone (Ctrl+C to stop)")
         try:
-            client.start_streaming(language)
-        except KeyboardInterrupt:
+            await client.start_streaming(language)
+        except (KeyboardInterrupt, asyncio.CancelledError):
             print("\n🛑 Stopping streaming...")
-            client.stop_streaming()
+            await client.stop_streaming()
     
     elif choice == "3":
         # WebSocket streaming
@@ -152,19 +194,19 @@ async def main():
         print("Speak into your microphone (Ctrl+C to stop)")
         try:
             await client.start_websocket_streaming(language)
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
             print("\n🛑 Stopping streaming...")
-            client.stop_streaming()
+            await client.stop_streaming()
     
     elif choice == "4":
         # Check status
-        status = client.get_status()
+        status = await client.get_status()
         print(f"\nSTT Service Status:")
         print(json.dumps(status, indent=2))
     
     elif choice == "5":
         # Reset statistics
-        result = client.reset_statistics()
+        result = await client.reset_statistics()
         print(f"\nReset result: {result}")
     
     else:
@@ -172,4 +214,10 @@ async def main():
 
 
 if __name__ == "__main__":
+    try:
+        # libuv-based event loop when installed; the default loop otherwise
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(main())
@@ -34,6 +34,22 @@ async def simulate_streaming_text() -> AsyncGenerator[str, None]:
         yield "\n"  # Add line break between sentences
         await asyncio.sleep(1.0)  # Pause between sentences
 
+async def group_into_phrases(word_stream: AsyncGenerator[str, None], max_words: int = 12) -> AsyncGenerator[str, None]:
+    """
+    Join streamed words into phrases, ending at sentence punctuation, a line
+    break or max_words, so each phrase is translated with a single call
+    """
+    words = []
+    async for token in word_stream:
+        word = token.strip()
+        if word:
+            words.append(word)
+        if words and (not word or word[-1] in ".?!" or len(words) >= max_words):
+            yield " ".join(words)
+            words = []
+    if words:
+        yield " ".join(words)
+
 async def test_single_translation():
     """Test single text translation"""
     print("🔄 Testing single text translation...")
@@ -71,10 +87,10 @@ async def test_streaming_translation():
     print("="*60)
     
     async for result in service.translate_stream(
-        text_stream=simulate_streaming_text(),
+        text_stream=group_into_phrases(simulate_streaming_text()),
         source_language="en",
         target_language="es",
-        batch_size=3,  # Process 3 words at a time
+        batch_size=1,  # Each phrase is already a whole sentence
         delay_ms=200   # 200ms delay between translations
     ):
         if result["success"]:
@@ -97,7 +113,7 @@ async def test_language_detection():
     ]
     
     for text in test_texts:
-        result = service.detect_language(text)
+        result = await service.detect_language(text)
         if result["language_code"]:
             print(f"📝 '{text}' → Detected: {result['language_code']} (confidence: {result['confidence']:.2f})")
         else:
@@ -168,4 +184,10 @@ async def main():
     print("\n✅ Test completed!")
 
 if __name__ == "__main__":
+    try:
+        # libuv-based event loop when installed; the default loop otherwise
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(main())
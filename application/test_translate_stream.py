@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script for rolling translate_stream captions
+Runs against a scripted model, so no Gemini API key is needed
+"""
+
+import asyncio
+import sys
+import os
+from typing import AsyncGenerator, List
+
+# Add the application directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from google.api_core import exceptions as google_exceptions
+
+from service.translate import TranslationService
+
+class ScriptedReply:
+    """Stands in for a Gemini response"""
+    def __init__(self, text: str):
+        self.text = text
+
+class ScriptedModel:
+    """Translates text as ES(<text>) and rejects the texts in fail_texts with a quota error"""
+    def __init__(self, fail_texts: List[str]):
+        self.fail_texts = set(fail_texts)
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        text = prompt.split("Text to translate:\n", 1)[-1]
+        if text in self.fail_texts:
+            raise google_exceptions.ResourceExhausted("quota exceeded")
+        return ScriptedReply(f"ES({text})")
+
+async def captions(chunks: List[str]) -> AsyncGenerator[str, None]:
+    """Yield growing live-caption transcripts"""
+    for chunk in chunks:
+        yield chunk
+
+async def test_rolling_prefix_failure() -> bool:
+    """A chunk extending a failed sentence must be translated whole"""
+    print("🔄 Testing rolling captions after a failed prefix...")
+
+    service = TranslationService()
+    service.model = ScriptedModel(fail_texts=["Hello there."])
+    service.is_initialized = True
+
+    results = [
+        result async for result in service.translate_stream(
+            captions(["Hello there.", "Hello there. Hi you"]),
+            source_language="en",
+            target_language="es",
+            delay_ms=0,
+            rolling=True
+        )
+    ]
+
+    for result in results:
+        print(f"   - {result['original_text']} -> {result['translated_text']} (success: {result['success']})")
+
+    last = results[-1]
+    passed = (
+        len(results) == 2
+        and not results[0]["success"]
+        and last["success"]
+        and last["original_text"] == "Hello there. Hi you"
+        and last["translated_text"] == "ES(Hello there. Hi you)"
+    )
+    print("✅ Caption kept its first sentence" if passed else "❌ Caption lost its first sentence")
+    return passed
+
+async def main():
+    """Main test function"""
+    print("🚀 Translate Stream Test")
+    print("=" * 50)
+
+    passed = await test_rolling_prefix_failure()
+
+    print("\n" + "=" * 50)
+    print("✅ Tests completed!" if passed else "❌ Tests failed!")
+    return 0 if passed else 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
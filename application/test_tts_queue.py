@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the TTS queue
+Checks that the worker stops promptly and that the queue keeps playing
+requests after a stop and restart
+"""
+
+import os
+import sys
+import tempfile
+import time
+import wave
+
+# Add the application directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from service.tts_queue import TTSQueue
+
+def make_silence(seconds: float) -> str:
+    """Write a silent WAV file standing in for synthesized speech"""
+    path = os.path.join(tempfile.gettempdir(), "tts_queue_test.wav")
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(8000)
+        wf.writeframes(b"\0\0" * int(8000 * seconds))
+    return path
+
+def test_stop_restart() -> bool:
+    """Stop while a phrase is playing, then queue another request"""
+    print("🔄 Testing stop and restart during playback...")
+
+    audio_file = make_silence(1.0)
+    played = []
+    tts_queue = TTSQueue()
+    tts_queue.set_callbacks(
+        lambda text, language_code: audio_file,
+        lambda audio_file, speaker1_config, speaker2_config: played.append(audio_file)
+    )
+
+    tts_queue.add_request("first phrase", "en-US", {}, {})
+    time.sleep(0.3)
+    tts_queue.stop_processing()
+
+    # add_request restarts the worker
+    tts_queue.add_request("second phrase", "en-US", {}, {})
+    time.sleep(2.5)
+
+    alive = tts_queue.processing_thread.is_alive()
+    print(f"   - Played: {len(played)}")
+    print(f"   - Worker alive: {alive}")
+    print(f"   - Queue size: {tts_queue.tts_queue.qsize()}")
+    tts_queue.stop_processing()
+
+    passed = len(played) == 2 and alive and tts_queue.tts_queue.qsize() == 0
+    print("✅ Restarted queue played the new request" if passed else "❌ Restarted queue is stuck")
+    return passed
+
+def test_idle_stop() -> bool:
+    """Stop a worker blocked waiting for requests"""
+    print("\n🔄 Testing stop while idle...")
+
+    tts_queue = TTSQueue()
+    tts_queue.start_processing()
+    time.sleep(0.2)
+
+    started = time.monotonic()
+    tts_queue.stop_processing()
+    elapsed = time.monotonic() - started
+
+    alive = tts_queue.processing_thread.is_alive()
+    print(f"   - Stopped in: {elapsed:.2f} seconds")
+    print(f"   - Worker alive: {alive}")
+    print(f"   - Queue size: {tts_queue.tts_queue.qsize()}")
+
+    passed = not alive and elapsed < 1.0 and tts_queue.tts_queue.qsize() == 0
+    print("✅ Idle worker stopped" if passed else "❌ Idle worker did not stop")
+    return passed
+
+def main():
+    """Main test function"""
+    print("🚀 TTS Queue Test")
+    print("=" * 50)
+
+    passed = test_stop_restart()
+    passed = test_idle_stop() and passed
+
+    print("\n" + "=" * 50)
+    print("✅ Tests completed!" if passed else "❌ Tests failed!")
+    return 0 if passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
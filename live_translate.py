@@ -1,26 +1,47 @@
 import whisper
-import warnings
+import torch
 import pyaudio
-import wave
 import threading
-import time
+import queue
 import numpy as np
-import tempfile
-import os
 from deep_translator import GoogleTranslator
+from collections import OrderedDict
+import re
 import json
+import os
 
-# Suppress the FP16 warning
-warnings.filterwarnings("ignore", message="FP16 is not supported on CPU; using FP32 instead")
+# Display flags per language pair; other pairs use the generic markers
+FLAGS = {
+    ("en", "ko"): ("🇺🇸", "🇰🇷"),
+    ("ko", "en"): ("🇰🇷", "🇺🇸"),
+}
+GENERIC_FLAGS = ("🔤", "🌍")
 
 class LiveTranslator:
-    def __init__(self, source_lang="en", target_lang="ko", model_name="base"):
+    def __init__(self, source_lang="en", target_lang="ko", model_name="base", silence_threshold=300):
+        # Intra-op threads on about one per physical core, leaving room for the
+        # recording thread; inter-op parallelism is not used by Whisper
+        torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Can only be set once per process, before any inter-op work
+            pass
         self.model = whisper.load_model(model_name)
+        # load_model places the model on CUDA when available; FP16 only runs there
+        self.fp16 = self.model.device.type == "cuda"
+        if hasattr(torch, "compile"):
+            self._compile_encoder()
         self.source_lang = source_lang
         self.target_lang = target_lang
+        self.flags = FLAGS.get((source_lang, target_lang), GENERIC_FLAGS)
+        # One translator for the whole session instead of one per chunk
+        self.translator = GoogleTranslator(source=source_lang, target=target_lang)
         self.audio = pyaudio.PyAudio()
-        self.is_recording = False
-        self.audio_frames = []
+        # Set to stop recording; the main thread blocks on it instead of polling
+        self._stop = threading.Event()
+        # Captured blocks from the PyAudio callback, consumed by the recording thread
+        self.audio_blocks = queue.SimpleQueue()
         
         # Audio settings
         self.format = pyaudio.paInt16
@@ -28,90 +49,123 @@ class LiveTranslator:
         self.rate = 16000
         self.chunk = 2048
         self.record_seconds = 2
+        # Float32 model input, reused for every window
+        self._f32 = np.empty(int(self.rate * self.record_seconds), dtype=np.float32)
+        # Chunks whose RMS level (16-bit scale) is below this are skipped as silence
+        self.silence_threshold = silence_threshold
         
-        # Translation cache to avoid re-translating the same text
-        self.translation_cache = {}
+        # LRU translation cache keyed by normalized text, so Whisper output that
+        # differs only in case or spacing is not translated again
+        self.translation_cache = OrderedDict()
+        self.translation_cache_size = 4096
         
+    def _compile_encoder(self):
+        """Compile the Whisper encoder once and warm it up, keeping eager mode if that fails"""
+        # Only the encoder: its input is always a padded 30-second mel, while the
+        # decoder's length changes every step and would keep recompiling
+        encoder = self.model.encoder
+        try:
+            self.model.encoder = torch.compile(encoder, mode="reduce-overhead", dynamic=False)
+            mel = torch.zeros(
+                (1, self.model.dims.n_mels, whisper.audio.N_FRAMES),
+                dtype=torch.float16 if self.fp16 else torch.float32,
+                device=self.model.device
+            )
+            # Pay the compilation cost here rather than on the first utterance
+            with torch.inference_mode():
+                self.model.embed_audio(mel)
+        except Exception as e:
+            print(f"⚠️ torch.compile unavailable, using eager mode: {e}")
+            self.model.encoder = encoder
+    
     def start_live_translation(self):
         """Start real-time transcription and translation"""
         print(f"🎤 Starting live translation: {self.source_lang.upper()} → {self.target_lang.upper()}")
         print("Speak into your microphone. Press Ctrl+C to stop.")
         print("-" * 60)
         
-        self.is_recording = True
+        self._stop.clear()
         
         # Start recording in a separate thread
         recording_thread = threading.Thread(target=self._record_audio)
         recording_thread.start()
         
         try:
-            while self.is_recording:
-                time.sleep(0.1)
+            # A timed wait, because an untimed one is not interrupted by Ctrl+C on Windows
+            while not self._stop.wait(0.5):
+                pass
         except KeyboardInterrupt:
             print("\n🛑 Stopping live translation...")
-            self.is_recording = False
+            self._stop.set()
             recording_thread.join()
         
         self.cleanup()
     
     def _record_audio(self):
-        """Record audio in chunks and transcribe/translate"""
+        """Capture audio via callback and transcribe/translate it in windows"""
         stream = self.audio.open(
             format=self.format,
             channels=self.channels,
             rate=self.rate,
             input=True,
             frames_per_buffer=self.chunk,
-            stream_callback=None
+            stream_callback=self._audio_callback
         )
         
         print("🎵 Listening...")
         
-        while self.is_recording:
-            frames = []
-            
-            # Record for specified duration
-            for _ in range(0, int(self.rate / self.chunk * self.record_seconds)):
-                if not self.is_recording:
-                    break
-                try:
-                    data = stream.read(self.chunk, exception_on_overflow=False)
-                    frames.append(data)
-                except OSError as e:
-                    if "Input overflowed" in str(e):
-                        continue
-                    else:
-                        raise e
+        # PyAudio keeps capturing on its own thread while Whisper runs here,
+        # so the input buffer no longer overflows during transcription
+        # Blocks are copied into one preallocated window that is reused for every
+        # chunk; _process_chunk converts it to float32 before anything else
+        window = np.empty(int(self.rate * self.record_seconds), dtype=np.int16)
+        filled = 0
+        while not self._stop.is_set():
+            try:
+                block = self.audio_blocks.get(timeout=0.5)
+            except queue.Empty:
+                continue
             
-            if frames:
-                # Transcribe and translate the audio chunk
-                self._process_chunk(frames)
+            while len(block):
+                count = min(len(block), len(window) - filled)
+                window[filled:filled + count] = block[:count]
+                filled += count
+                block = block[count:]
+                
+                if filled == len(window):
+                    # Transcribe and translate the audio chunk
+                    self._process_chunk(window)
+                    filled = 0
         
         stream.stop_stream()
         stream.close()
     
-    def _process_chunk(self, frames):
-        """Transcribe and translate a chunk of audio"""
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """PyAudio callback: hand each captured block to the recording thread"""
+        self.audio_blocks.put(np.frombuffer(in_data, dtype=np.int16))
+        return (None, pyaudio.paContinue)
+    
+    def _process_chunk(self, pcm):
+        """Transcribe and translate a chunk of 16-bit PCM audio"""
         try:
-            # Save audio chunk to temporary file
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                wf = wave.open(temp_file.name, 'wb')
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(self.audio.get_sample_size(self.format))
-                wf.setframerate(self.rate)
-                wf.writeframes(b''.join(frames))
-                wf.close()
-                
-                # Transcribe using Whisper
-                result = self.model.transcribe(temp_file.name, language=self.source_lang)
-                original_text = result["text"].strip()
-                
-                # Clean up temporary file
-                os.unlink(temp_file.name)
-                
-                # Process if there's actual content
-                if original_text:
-                    self._translate_and_display(original_text)
+            # Whisper takes 16 kHz mono float32 directly, so skip the temporary WAV file.
+            # Cast and scale in one pass into the preallocated buffer
+            audio_data = self._f32
+            np.multiply(pcm, np.float32(1.0 / 32768.0), out=audio_data)
+            
+            # Skip Whisper entirely for silent chunks; the dot product computes the
+            # sum of squares without a temporary array
+            if np.sqrt(np.dot(audio_data, audio_data) / len(audio_data)) * 32768.0 < self.silence_threshold:
+                return
+            
+            # Transcribe using Whisper
+            with torch.inference_mode():
+                result = self.model.transcribe(audio_data, language=self.source_lang, fp16=self.fp16)
+            original_text = result["text"].strip()
+            
+            # Process if there's actual content
+            if original_text:
+                self._translate_and_display(original_text)
                     
         except Exception as e:
             print(f"❌ Processing error: {e}")
@@ -119,28 +173,12 @@ class LiveTranslator:
     def _translate_and_display(self, original_text):
         """Translate text and display both original and translated versions"""
         try:
-            # Check cache first
-            if original_text in self.translation_cache:
-                translated_text = self.translation_cache[original_text]
-            else:
-                # Translate the text
-                translator = GoogleTranslator(source=self.source_lang, target=self.target_lang)
-                translated_text = translator.translate(original_text)
-                
-                # Cache the translation
-                self.translation_cache[original_text] = translated_text
+            translated_text = self._cached_translate(original_text)
             
             # Display results with appropriate flags
-            if self.source_lang == "en" and self.target_lang == "ko":
-                print(f"🇺🇸 {original_text}")
-                print(f"🇰🇷 {translated_text}")
-            elif self.source_lang == "ko" and self.target_lang == "en":
-                print(f"🇰🇷 {original_text}")
-                print(f"🇺🇸 {translated_text}")
-            else:
-                # Generic display for other language pairs
-                print(f"🔤 {original_text}")
-                print(f"🌍 {translated_text}")
+            source_flag, target_flag = self.flags
+            print(f"{source_flag} {original_text}")
+            print(f"{target_flag} {translated_text}")
             print("-" * 40)
             
         except Exception as e:
@@ -148,6 +186,19 @@ class LiveTranslator:
             print(f"🇺🇸 {original_text}")
             print("-" * 40)
     
+    def _cached_translate(self, text):
+        """Translate text, reusing the translation of an earlier matching transcript"""
+        key = re.sub(r"\s+", " ", text).strip().casefold()
+        if key in self.translation_cache:
+            self.translation_cache.move_to_end(key)
+            return self.translation_cache[key]
+        
+        translated_text = self.translator.translate(text)
+        self.translation_cache[key] = translated_text
+        if len(self.translation_cache) > self.translation_cache_size:
+            self.translation_cache.popitem(last=False)
+        return translated_text
+    
     def cleanup(self):
         """Clean up audio resources"""
         self.audio.terminate()
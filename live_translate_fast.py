@@ -1,45 +1,120 @@
-import whisper
-import warnings
+from faster_whisper import WhisperModel
+import ctranslate2
 import pyaudio
 import wave
 import threading
-import time
 import numpy as np
 import tempfile
 import os
-from deep_translator import GoogleTranslator
+import httpx
+from collections import OrderedDict
+import re
 import queue
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import io
 
-# Suppress the FP16 warning
-warnings.filterwarnings("ignore", message="FP16 is not supported on CPU; using FP32 instead")
+TRANSLATE_URL = "https://translate.googleapis.com/translate_a/single"
+# Most capture windows waiting for transcription before new ones are dropped
+AUDIO_QUEUE_SIZE = 10
+# Most queued windows transcribed together when transcription falls behind
+MAX_BATCH_WINDOWS = 4
+# How long the display waits for a translation after showing the original text
+TRANSLATION_WAIT_SECONDS = 5.0
+# Interim results: audio added between streaming transcriptions, and the most
+# uncommitted audio kept before its hypothesis is committed as is
+STREAM_HOP_SECONDS = 0.5
+MAX_PENDING_SECONDS = 15
+
+# Display flags per language pair; other pairs use the generic markers
+FLAGS = {
+    ("en", "ko"): ("🇺🇸", "🇰🇷"),
+    ("ko", "en"): ("🇰🇷", "🇺🇸"),
+}
+GENERIC_FLAGS = ("🔤", "🌍")
+
+def _raise_thread_priority():
+    """Best effort: give the calling thread real-time or top scheduling priority"""
+    try:
+        if hasattr(os, "sched_setscheduler"):
+            # Linux: pid 0 is the calling thread; needs CAP_SYS_NICE or an rtprio limit
+            os.sched_setscheduler(0, os.SCHED_RR, os.sched_param(50))
+        elif os.name == "nt":
+            import ctypes
+            THREAD_PRIORITY_TIME_CRITICAL = 15
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_TIME_CRITICAL)
+    except (OSError, AttributeError):
+        # Not permitted here; the thread keeps its default priority
+        pass
 
 class FastLiveTranslator:
-    def __init__(self, source_lang="en", target_lang="ko", model_name="tiny"):
-        # Use tiny model for faster processing
-        self.model = whisper.load_model(model_name)
+    def __init__(self, source_lang="en", target_lang="ko", model_name="tiny", silence_threshold=300,
+                 nmt_model_dir=None, interim_results=False):
+        # Use tiny model for faster processing, run by CTranslate2 with INT8
+        # weights instead of FP32 PyTorch on the CPU
+        self.model = WhisperModel(
+            model_name,
+            device="cpu",
+            compute_type="int8",
+            cpu_threads=max(1, (os.cpu_count() or 2) // 2),
+            num_workers=1
+        )
         self.source_lang = source_lang
         self.target_lang = target_lang
+        self.flags = FLAGS.get((source_lang, target_lang), GENERIC_FLAGS)
+        # One keep-alive HTTP/2 connection to the translate endpoint for the whole
+        # session, instead of a new connection per utterance
+        self._http = httpx.Client(http2=True, timeout=2.0)
+        # Optional on-device translation: a CTranslate2 conversion of an OPUS-MT
+        # (Marian) model for this language pair, used instead of the endpoint
+        self.nmt = None
+        if nmt_model_dir:
+            self._load_nmt(nmt_model_dir)
         self.audio = pyaudio.PyAudio()
         self.is_recording = False
+        # Stream interim hypotheses and commit words once they are stable, instead
+        # of transcribing fixed windows
+        self.interim_results = interim_results
+        self._interim_width = 0
         
         # Audio settings optimized for speed
         self.format = pyaudio.paInt16
         self.channels = 1
         self.rate = 16000
         self.chunk = 1024  # Smaller chunks for more frequent processing
-        self.record_seconds = 1.5  # Shorter chunks for faster response
+        self.record_seconds = STREAM_HOP_SECONDS if interim_results else 1.5  # Shorter chunks for faster response
+        # Fixed for the session, so computed once rather than per chunk
+        self._chunks_per_window = int(self.rate / self.chunk * self.record_seconds)
+        # Chunks whose RMS level (16-bit scale) is below this are skipped as silence
+        self.silence_threshold = silence_threshold
         
         # Queues for async processing
-        self.audio_queue = queue.Queue(maxsize=10)
-        self.result_queue = queue.Queue()
+        # Captured blocks from the PyAudio callback, consumed by the recording thread
+        self.audio_blocks = queue.SimpleQueue()
+        # SimpleQueue hands items over without Queue's lock and conditions; the
+        # audio queue is bounded by the recording thread, its only producer
+        self.audio_queue = queue.SimpleQueue()
+        self.result_queue = queue.SimpleQueue()
         
-        # Translation cache
-        self.translation_cache = {}
+        # Preallocated capture windows, reused in turn: enough for a full queue plus
+        # a batch being transcribed and the window being filled
+        window_samples = self._chunks_per_window * self.chunk
+        self._windows = np.empty(
+            (AUDIO_QUEUE_SIZE + MAX_BATCH_WINDOWS + 1, window_samples), dtype=np.int16
+        )
+        # Float32 input for the model, only touched by the processing thread
+        self._f32 = np.empty(MAX_BATCH_WINDOWS * window_samples, dtype=np.float32)
         
-        # Thread pool for parallel processing
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        # LRU translation cache keyed by normalized text, so Whisper output that
+        # differs only in case or spacing is not translated again
+        self.translation_cache = OrderedDict()
+        self.translation_cache_size = 4096
+        # Guards the cache, which both the processing and translation threads use
+        self._cache_lock = threading.Lock()
+        
+        # Translation stage: runs while the next chunk is transcribed. A single
+        # worker keeps results in the order they were spoken
+        self.executor = ThreadPoolExecutor(max_workers=1)
         
     def start_live_translation(self):
         """Start real-time transcription and translation"""
@@ -49,9 +124,16 @@ class FastLiveTranslator:
         
         self.is_recording = True
         
-        # Start multiple threads for parallel processing
-        audio_thread = threading.Thread(target=self._record_audio)
-        process_thread = threading.Thread(target=self._process_audio_queue)
+        # Open the keep-alive connection before the first utterance needs it
+        self.executor.submit(self._warm_up_translation)
+        
+        # Start multiple threads for parallel processing; daemon threads never keep
+        # the process alive if stopping does not reach them
+        audio_thread = threading.Thread(target=self._record_audio, daemon=True)
+        process_thread = threading.Thread(
+            target=self._process_audio_stream if self.interim_results else self._process_audio_queue,
+            daemon=True
+        )
         
         audio_thread.start()
         process_thread.start()
@@ -60,10 +142,10 @@ class FastLiveTranslator:
             while self.is_recording:
                 # Display results from result queue
                 try:
-                    result = self.result_queue.get_nowait()
+                    result = self.result_queue.get(timeout=0.1)
                     self._display_result(result)
                 except queue.Empty:
-                    time.sleep(0.1)
+                    continue
         except KeyboardInterrupt:
             print("\n🛑 Stopping live translation...")
             self.is_recording = False
@@ -73,142 +155,315 @@ class FastLiveTranslator:
         self.cleanup()
     
     def _record_audio(self):
-        """Record audio in chunks and add to queue"""
+        """Capture audio via callback and queue it in fixed-length windows"""
         stream = self.audio.open(
             format=self.format,
             channels=self.channels,
             rate=self.rate,
             input=True,
             frames_per_buffer=self.chunk,
-            stream_callback=None
+            stream_callback=self._audio_callback
         )
         
         print("🎵 Listening...")
         
+        # Keep window assembly ahead of the model and translation threads under load
+        _raise_thread_priority()
+        
+        # PyAudio captures on its own thread, so a slow pass here no longer
+        # overflows the input buffer; blocks just wait in audio_blocks
+        slot = 0
+        window = self._windows[slot]
+        filled = 0
         while self.is_recording:
-            frames = []
-            
-            # Record for specified duration
-            for _ in range(0, int(self.rate / self.chunk * self.record_seconds)):
-                if not self.is_recording:
-                    break
-                try:
-                    data = stream.read(self.chunk, exception_on_overflow=False)
-                    frames.append(data)
-                except OSError as e:
-                    if "Input overflowed" in str(e):
-                        continue
-                    else:
-                        raise e
+            try:
+                block = self.audio_blocks.get(timeout=0.1)
+            except queue.Empty:
+                continue
             
-            if frames:
-                # Add to processing queue
-                try:
-                    self.audio_queue.put_nowait(frames)
-                except queue.Full:
-                    # Skip this chunk if queue is full
-                    continue
+            while len(block):
+                count = min(len(block), len(window) - filled)
+                window[filled:filled + count] = block[:count]
+                filled += count
+                block = block[count:]
+                
+                if filled == len(window):
+                    # Add to processing queue, or skip this chunk if the queue is
+                    # full; its window is refilled
+                    if self.audio_queue.qsize() < AUDIO_QUEUE_SIZE:
+                        self.audio_queue.put(window)
+                        slot = (slot + 1) % len(self._windows)
+                    window = self._windows[slot]
+                    filled = 0
         
         stream.stop_stream()
         stream.close()
     
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """PyAudio callback: hand each captured block to the recording thread"""
+        self.audio_blocks.put(np.frombuffer(in_data, dtype=np.int16))
+        return (None, pyaudio.paContinue)
+    
     def _process_audio_queue(self):
-        """Process audio chunks from queue"""
+        """Transcribe audio chunks from queue and hand the text to the translation stage"""
+        while self.is_recording:
+            try:
+                batch = [self.audio_queue.get(timeout=0.1)]
+                # Take any backlog along in the same call: the model pads every
+                # input to 30 seconds, so a few windows cost about as much as one
+                while len(batch) < MAX_BATCH_WINDOWS:
+                    try:
+                        batch.append(self.audio_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                original_text = self._transcribe(batch)
+                if original_text:
+                    # Translate in the background and display the original right away;
+                    # the display fills in the translation when the future completes
+                    future = self._translation_future(original_text)
+                    self.result_queue.put({'original': original_text, 'translated': future})
+            except queue.Empty:
+                continue
+            except Exception as e:
+                print(f"❌ Processing error: {e}")
+    
+    def _process_audio_stream(self):
+        """Re-transcribe the uncommitted audio every hop; words two hypotheses in a
+        row agree on are committed, the rest is shown as interim text"""
+        pending = np.empty(0, dtype=np.float32)
+        hypothesis = []
         while self.is_recording:
             try:
-                frames = self.audio_queue.get(timeout=0.1)
-                # Process in thread pool for non-blocking operation
-                future = self.executor.submit(self._transcribe_and_translate, frames)
-                # Add result to display queue
-                self.result_queue.put(future.result())
+                windows = [self.audio_queue.get(timeout=0.1)]
+                while True:
+                    try:
+                        windows.append(self.audio_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                # Cast and scale each window in one pass straight into the hop buffer
+                hop = np.empty(sum(len(pcm) for pcm in windows), dtype=np.float32)
+                offset = 0
+                for pcm in windows:
+                    np.multiply(pcm, np.float32(1.0 / 32768.0), out=hop[offset:offset + len(pcm)])
+                    offset += len(pcm)
+                
+                if np.sqrt(np.dot(hop, hop) / len(hop)) * 32768.0 < self.silence_threshold:
+                    # A pause ends the utterance: commit whatever is still interim
+                    if hypothesis:
+                        self._commit_words(hypothesis)
+                        self.result_queue.put({'interim': ''})
+                    pending = pending[:0]
+                    hypothesis = []
+                    continue
+                
+                pending = np.concatenate((pending, hop))
+                words = self._transcribe_words(pending)
+                
+                # Only the prefix unchanged since the previous hypothesis is stable,
+                # unless the pending audio has grown too long to keep waiting
+                stable = 0
+                for new, old in zip(words, hypothesis):
+                    if new.word.strip().casefold() != old.word.strip().casefold():
+                        break
+                    stable += 1
+                if len(pending) >= MAX_PENDING_SECONDS * self.rate:
+                    stable = len(words)
+                    if not words:
+                        # Loud audio with no speech in it: drop it rather than
+                        # decode an ever longer buffer every hop
+                        pending = pending[:0]
+                
+                if stable:
+                    self._commit_words(words[:stable])
+                    # Drop the committed audio so it is not decoded again
+                    pending = pending[int(words[stable - 1].end * self.rate):]
+                    words = words[stable:]
+                
+                hypothesis = words
+                self.result_queue.put({'interim': "".join(w.word for w in words).strip()})
             except queue.Empty:
                 continue
             except Exception as e:
                 print(f"❌ Processing error: {e}")
     
-    def _transcribe_and_translate(self, frames):
-        """Transcribe and translate audio frames"""
+    def _transcribe_words(self, audio_data):
+        """Transcribe float32 audio, returning its words with timestamps"""
+        segments, _ = self.model.transcribe(
+            audio_data,
+            language=self.source_lang,
+            task="transcribe",
+            beam_size=1,
+            vad_filter=False,
+            condition_on_previous_text=False,
+            word_timestamps=True
+        )
+        return [word for segment in segments for word in (segment.words or [])]
+    
+    def _commit_words(self, words):
+        """Send committed words to the display, with their translation to follow"""
+        original_text = "".join(w.word for w in words).strip()
+        if original_text:
+            future = self._translation_future(original_text)
+            self.result_queue.put({'original': original_text, 'translated': future})
+    
+    def _transcribe(self, windows):
+        """Transcribe consecutive windows of 16-bit PCM audio, returning the text or None"""
         try:
-            # Convert audio frames to numpy array for faster processing
-            audio_data = np.frombuffer(b''.join(frames), dtype=np.int16)
+            filled = 0
+            for pcm in windows:
+                # Normalize audio: cast and scale in one pass into the preallocated buffer
+                audio_data = self._f32[filled:filled + len(pcm)]
+                np.multiply(pcm, np.float32(1.0 / 32768.0), out=audio_data)
+                
+                # Keep only voiced windows; a silent one is overwritten by the next.
+                # The dot product computes the sum of squares without a temporary array
+                if np.sqrt(np.dot(audio_data, audio_data) / len(audio_data)) * 32768.0 >= self.silence_threshold:
+                    filled += len(pcm)
             
-            # Normalize audio
-            audio_data = audio_data.astype(np.float32) / 32768.0
+            # Skip the model entirely when every window was silent
+            if not filled:
+                return None
             
-            # Use Whisper's transcribe with optimized settings
-            result = self.model.transcribe(
-                audio_data,
+            # Greedy decoding; each batch is transcribed on its own
+            segments, _ = self.model.transcribe(
+                self._f32[:filled],
                 language=self.source_lang,
                 task="transcribe",
-                fp16=False,  # Use FP32 for CPU
-                verbose=False  # Reduce output
+                beam_size=1,
+                vad_filter=False,
+                condition_on_previous_text=False
             )
             
-            original_text = result["text"].strip()
-            
-            if original_text:
-                return self._translate_text(original_text)
-            return None
+            # Segments are generated lazily, so joining them runs the decoding
+            original_text = "".join(segment.text for segment in segments).strip()
+            return original_text or None
                     
         except Exception as e:
             print(f"❌ Transcription error: {e}")
             return None
     
+    def _translation_future(self, original_text):
+        """Return a future for the translation, already resolved on a cache hit"""
+        # Repeated utterances skip the executor hop entirely
+        cached = self._lookup_translation(self._cache_key(original_text))
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+        return self.executor.submit(self._translate_text, original_text)
+    
     def _translate_text(self, original_text):
         """Translate text with caching"""
         try:
-            # Check cache first
-            if original_text in self.translation_cache:
-                translated_text = self.translation_cache[original_text]
-            else:
-                # Translate the text
-                translator = GoogleTranslator(source=self.source_lang, target=self.target_lang)
-                translated_text = translator.translate(original_text)
-                
-                # Cache the translation
-                self.translation_cache[original_text] = translated_text
-            
-            return {
-                'original': original_text,
-                'translated': translated_text
-            }
-            
+            return self._cached_translate(original_text)
         except Exception as e:
             print(f"❌ Translation error: {e}")
-            return {
-                'original': original_text,
-                'translated': '[Translation Error]'
-            }
+            return '[Translation Error]'
+    
+    def _warm_up_translation(self):
+        """Send one throwaway request so the HTTP connection is already open"""
+        try:
+            self._do_translate("hi")
+        except Exception as e:
+            print(f"⚠️ Translation warm-up failed: {e}")
     
     def _display_result(self, result):
-        """Display translation result"""
+        """Display the original text, then its translation once it is ready"""
         if not result:
             return
-            
-        original_text = result['original']
-        translated_text = result['translated']
         
         # Display results with appropriate flags
-        if self.source_lang == "en" and self.target_lang == "ko":
-            print(f"🇺🇸 {original_text}")
-            print(f"🇰🇷 {translated_text}")
-        elif self.source_lang == "ko" and self.target_lang == "en":
-            print(f"🇰🇷 {original_text}")
-            print(f"🇺🇸 {translated_text}")
-        else:
-            # Generic display for other language pairs
-            print(f"🔤 {original_text}")
-            print(f"🌍 {translated_text}")
+        source_flag, target_flag = self.flags
+        self._clear_interim()
+        
+        if 'interim' in result:
+            # Interim text stays on one line that the next update overwrites
+            if result['interim']:
+                line = f"{source_flag} {result['interim']} …"
+                print(line, end="", flush=True)
+                self._interim_width = len(line)
+            return
+        
+        print(f"{source_flag} {result['original']}", flush=True)
+        
+        try:
+            translated_text = result['translated'].result(timeout=TRANSLATION_WAIT_SECONDS)
+        except FutureTimeoutError:
+            translated_text = '[Translation Timeout]'
+        print(f"{target_flag} {translated_text}")
         print("-" * 40)
     
+    def _clear_interim(self):
+        """Erase the interim line, if one is shown"""
+        if self._interim_width:
+            print("\r" + " " * self._interim_width + "\r", end="")
+            self._interim_width = 0
+    
+    @staticmethod
+    def _cache_key(text):
+        """Normalize a transcript so case and spacing differences share one entry"""
+        return re.sub(r"\s+", " ", text).strip().casefold()
+    
+    def _lookup_translation(self, key):
+        """Return the cached translation for key, or None"""
+        with self._cache_lock:
+            translated_text = self.translation_cache.get(key)
+            if translated_text is not None:
+                self.translation_cache.move_to_end(key)
+            return translated_text
+    
+    def _cached_translate(self, text):
+        """Translate text, reusing the translation of an earlier matching transcript"""
+        key = self._cache_key(text)
+        translated_text = self._lookup_translation(key)
+        if translated_text is not None:
+            return translated_text
+        
+        translated_text = self._do_translate(text)
+        with self._cache_lock:
+            self.translation_cache[key] = translated_text
+            if len(self.translation_cache) > self.translation_cache_size:
+                self.translation_cache.popitem(last=False)
+        return translated_text
+    
+    def _load_nmt(self, model_dir):
+        """Load a local CTranslate2 translation model and its SentencePiece tokenizers"""
+        import sentencepiece as spm
+        
+        self.nmt = ctranslate2.Translator(model_dir, device="cpu", compute_type="int8")
+        self._sp_source = spm.SentencePieceProcessor(model_file=os.path.join(model_dir, "source.spm"))
+        self._sp_target = spm.SentencePieceProcessor(model_file=os.path.join(model_dir, "target.spm"))
+    
+    def _do_translate(self, text):
+        """Translate text with the local model if loaded, else with one request to the Google Translate endpoint"""
+        if self.nmt is not None:
+            tokens = self._sp_source.encode(text, out_type=str) + ["</s>"]
+            result = self.nmt.translate_batch([tokens], beam_size=1)[0]
+            return self._sp_target.decode(result.hypotheses[0])
+        
+        response = self._http.get(
+            TRANSLATE_URL,
+            params={
+                "client": "gtx",
+                "sl": self.source_lang,
+                "tl": self.target_lang,
+                "dt": "t",
+                "q": text
+            }
+        )
+        response.raise_for_status()
+        # The first element lists [translated, original, ...] per sentence
+        return "".join(part[0] for part in response.json()[0] if part[0])
+    
     def cleanup(self):
         """Clean up resources"""
         self.executor.shutdown(wait=True)
+        self._http.close()
         self.audio.terminate()
         print("✅ Fast live translation stopped.")
 
 def main():
-    print("🚀 FAST Live Translation with Whisper")
+    print("🚀 FAST Live Translation with faster-whisper")
     print("=" * 50)
     
     # Language options
@@ -241,11 +496,16 @@ def main():
     else:
         source_lang, target_lang = "en", "ko"
     
+    interim_results = input("Show interim results while speaking? (y/N): ").strip().lower() == "y"
+    nmt_model_dir = input("Local CTranslate2 translation model directory (Enter for Google Translate): ").strip()
+    
     # Create translator instance with tiny model for speed
     translator = FastLiveTranslator(
         source_lang=source_lang, 
         target_lang=target_lang, 
-        model_name="tiny"  # Use tiny model for maximum speed
+        model_name="tiny",  # Use tiny model for maximum speed
+        nmt_model_dir=nmt_model_dir or None,
+        interim_results=interim_results
     )
     
     try:
@@ -31,6 +31,11 @@ import psutil
 class SpeechToTextStreamer:
     """High-performance speech-to-text streaming with minimal latency."""
     
+    # How often the monitor refreshes its CPU and memory readings
+    PSUTIL_REFRESH_SECONDS = 30
+    # Audio chunks sent together in one streaming request
+    COALESCE_CHUNKS = 4
+    
     def __init__(self, 
                  sample_rate: int = 16000,
                  chunk_size: int = 1024,
@@ -147,17 +152,28 @@ class SpeechToTextStreamer:
         """Process audio stream in separate thread for better performance."""
         def audio_generator() -> Generator[bytes, None, None]:
             """Generate audio chunks for streaming recognition."""
+            # Several callback chunks go out per request (~256 ms at the defaults),
+            # cutting gRPC frames and protobuf serialization per second
+            buffer = bytearray()
+            target_bytes = self.COALESCE_CHUNKS * self.chunk_size * 2  # 16-bit samples
             while self.is_streaming:
                 try:
                     # Get audio chunk with timeout to prevent blocking
                     chunk = self.audio_queue.get(timeout=0.1)
-                    yield chunk
+                    buffer.extend(chunk)
                     self.processed_chunks += 1
+                    if len(buffer) >= target_bytes:
+                        yield bytes(buffer)
+                        buffer.clear()
                 except queue.Empty:
                     continue
                 except Exception as e:
                     print(f"Audio processing error: {e}")
                     break
+            
+            # Send the partial batch too, so the end of the last utterance is kept
+            if buffer:
+                yield bytes(buffer)
         
         # Configure streaming recognition
         config = speech.RecognitionConfig(
@@ -296,18 +312,29 @@ class SpeechToTextStreamer:
     
     def _monitor_performance(self):
         """Monitor and display performance metrics."""
+        # psutil walks /proc (or PDH counters) on every call, so system stats are
+        # only refreshed every PSUTIL_REFRESH_SECONDS; chunks/sec is plain arithmetic
+        cpu_percent = memory_percent = None
+        last_refresh = None
         while self.is_streaming:
             time.sleep(5)  # Update every 5 seconds
             
             if self.start_time:
+                now = time.monotonic()
                 elapsed = time.time() - self.start_time
                 chunks_per_sec = self.processed_chunks / elapsed if elapsed > 0 else 0
+                
+                if last_refresh is None or now - last_refresh >= self.PSUTIL_REFRESH_SECONDS:
+                    if self.monitor_cpu:
+                        cpu_percent = psutil.cpu_percent()
+                    if self.monitor_memory:
+                        memory_percent = psutil.virtual_memory().percent
+                    last_refresh = now
+                
                 metrics_parts = [f"{chunks_per_sec:.1f} chunks/sec"]
                 if self.monitor_cpu:
-                    cpu_percent = psutil.cpu_percent()
                     metrics_parts.append(f"CPU: {cpu_percent:.1f}%")
                 if self.monitor_memory:
-                    memory_percent = psutil.virtual_memory().percent
                     metrics_parts.append(f"Memory: {memory_percent:.1f}%")
                 print("\n📊 Performance: " + " | ".join(metrics_parts))
     
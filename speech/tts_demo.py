@@ -17,13 +17,20 @@ Before running this demo, make sure you have:
 """
 
 import os
+import io
+import functools
+import queue
+import threading
+import hashlib
 import tempfile
 import time
 import subprocess
 import sys
 import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 try:
     from google.cloud import texttospeech
@@ -36,8 +43,18 @@ except ImportError as e:
     exit(1)
 
 
+# Posted by pygame when music playback ends
+MUSIC_END = pygame.USEREVENT + 1
+
+# Fields every service account key must contain
+REQUIRED_CREDENTIAL_FIELDS = frozenset({
+    'type', 'project_id', 'private_key_id', 'private_key', 'client_email', 'client_id'
+})
+
+
+@functools.lru_cache(maxsize=1)
 def find_credentials_file():
-    """Find the credentials.json file in common locations"""
+    """Find the credentials.json file in common locations (searched once per process)"""
     possible_locations = [
         "credentials.json",  # Current directory
         "../credentials.json",  # Parent directory
@@ -61,11 +78,10 @@ def validate_credentials_file(credentials_path: str) -> bool:
             creds = json.load(f)
         
         # Check for required fields in service account key
-        required_fields = ['type', 'project_id', 'private_key_id', 'private_key', 'client_email', 'client_id']
-        for field in required_fields:
-            if field not in creds:
-                print(f"Missing required field '{field}' in credentials.json")
-                return False
+        missing_fields = REQUIRED_CREDENTIAL_FIELDS - creds.keys()
+        if missing_fields:
+            print(f"Missing required fields {sorted(missing_fields)} in credentials.json")
+            return False
         
         if creds.get('type') != 'service_account':
             print("Credentials file must be a service account key")
@@ -80,6 +96,28 @@ def validate_credentials_file(credentials_path: str) -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=1)
+def _load_credentials():
+    """Parse the service account key once; the RSA key load is the expensive part"""
+    credentials_path = find_credentials_file()
+    if not credentials_path:
+        raise FileNotFoundError("credentials.json file not found")
+    
+    # Create credentials from service account file
+    credentials = service_account.Credentials.from_service_account_file(
+        credentials_path,
+        scopes=['https://www.googleapis.com/auth/cloud-platform']
+    )
+    return credentials_path, credentials
+
+
+@functools.lru_cache(maxsize=1)
+def _get_tts_client():
+    """TTS client shared by the authentication check and every TTSDemo, so they use one channel"""
+    _, credentials = _load_credentials()
+    return texttospeech.TextToSpeechClient(credentials=credentials)
+
+
 def check_authentication():
     """Check if Google Cloud authentication is properly set up using credentials.json"""
     credentials_path = find_credentials_file()
@@ -92,14 +130,8 @@ def check_authentication():
         return False
     
     try:
-        # Create credentials from service account file
-        credentials = service_account.Credentials.from_service_account_file(
-            credentials_path,
-            scopes=['https://www.googleapis.com/auth/cloud-platform']
-        )
-        
         # Try to create a client to test authentication
-        client = texttospeech.TextToSpeechClient(credentials=credentials)
+        _get_tts_client()
         print(f"Authentication successful using: {credentials_path}")
         return True
     except Exception as e:
@@ -133,6 +165,16 @@ def setup_authentication():
 class TTSDemo:
     """Text-to-Speech Demo class using Google Cloud Text-to-Speech"""
     
+    # Size cap for audio kept in memory for repeated phrases
+    MEMORY_CACHE_BYTES = 10 * 1024 * 1024
+    # Size cap for the disk cache; the least recently used files go first
+    DISK_CACHE_BYTES = 50 * 1024 * 1024
+    # Streaming synthesis: supported voice family and its raw LINEAR16 output rate
+    STREAMING_VOICE = "Chirp3-HD-Charon"
+    STREAMING_SAMPLE_RATE = 24000
+    # Concurrent synthesis requests in speak_many
+    MAX_PARALLEL_SYNTHESIS = 8
+    
     def __init__(self, language_code: str = 'en-US', voice_gender: str = 'NEUTRAL'):
         """
         Initialize TTS Demo
@@ -145,20 +187,24 @@ class TTSDemo:
         self.voice_gender = getattr(texttospeech.SsmlVoiceGender, voice_gender)
         self.temp_dir = tempfile.gettempdir()
         
+        # Synthesized audio persists here across runs, named by a hash of its inputs
+        self.cache_dir = Path(self.temp_dir) / "tts_cache"
+        self.cache_dir.mkdir(exist_ok=True)
+        # LRU of recently played audio, evicted by total size
+        self._audio_memory = OrderedDict()
+        self._audio_memory_bytes = 0
+        
         # Initialize Google Cloud Text-to-Speech client with credentials.json
         try:
-            credentials_path = find_credentials_file()
-            if not credentials_path:
-                raise FileNotFoundError("credentials.json file not found")
-            
-            # Create credentials from service account file
-            credentials = service_account.Credentials.from_service_account_file(
-                credentials_path,
-                scopes=['https://www.googleapis.com/auth/cloud-platform']
-            )
-            
-            self.client = texttospeech.TextToSpeechClient(credentials=credentials)
+            credentials_path, _ = _load_credentials()
+            self.client = _get_tts_client()
             print(f"Google Cloud TTS client initialized successfully using: {credentials_path}")
+            
+            # Open the channel (TLS and HTTP/2 handshake) now instead of on the first phrase
+            try:
+                self.client.list_voices(language_code=language_code)
+            except Exception as e:
+                print(f"Warning: TTS connection warm-up failed: {e}")
         except Exception as e:
             print(f"Failed to initialize Google Cloud TTS client: {e}")
             print("Make sure you have:")
@@ -170,6 +216,15 @@ class TTSDemo:
         # Initialize pygame mixer for audio playback
         pygame.mixer.init()
         
+        # Wait for an end-of-playback event instead of polling; pygame's event
+        # queue needs the video subsystem, which may be missing on headless hosts
+        try:
+            pygame.display.init()
+            pygame.mixer.music.set_endevent(MUSIC_END)
+            self._end_events = True
+        except pygame.error:
+            self._end_events = False
+        
         print(f"TTS Demo initialized - Language: {language_code}, Voice Gender: {voice_gender}")
     
     def text_to_speech(self, text: str, filename: Optional[str] = None) -> str:
@@ -178,12 +233,28 @@ class TTSDemo:
         
         Args:
             text: Text to convert to speech
-            filename: Optional filename for the audio file
+            filename: Optional filename for the audio file; the audio is Ogg Opus,
+                so the name gets an .ogg suffix. Without one the audio is cached and
+                repeated requests skip synthesis
             
         Returns:
             Path to the generated audio file
         """
         try:
+            if filename is None:
+                filepath = self._cache_path(text)
+                if filepath.exists():
+                    # Mark it recently used for the disk cache trimming
+                    try:
+                        os.utime(filepath)
+                    except OSError:
+                        pass
+                    print(f"Using cached audio: {filepath}")
+                    return str(filepath)
+            else:
+                # Save to temporary directory, named for the Ogg Opus content
+                filepath = (Path(self.temp_dir) / filename).with_suffix(".ogg")
+            
             print(f"Converting text to speech: '{text}'")
             
             # Set the text input to be synthesized
@@ -195,9 +266,11 @@ class TTSDemo:
                 ssml_gender=self.voice_gender
             )
             
-            # Select the type of audio file you want returned
+            # Select the type of audio file you want returned: Opus in Ogg is
+            # smaller than MP3 at similar quality, and SDL_mixer plays it directly
             audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3
+                audio_encoding=texttospeech.AudioEncoding.OGG_OPUS,
+                sample_rate_hertz=24000
             )
             
             # Perform the text-to-speech request on the text input with the selected
@@ -206,43 +279,104 @@ class TTSDemo:
                 input=synthesis_input, voice=voice, audio_config=audio_config
             )
             
-            # Generate filename if not provided
-            if filename is None:
-                timestamp = int(time.time())
-                filename = f"tts_output_{timestamp}.mp3"
-            
-            # Save to temporary directory
-            filepath = os.path.join(self.temp_dir, filename)
-            
-            # The response's audio_content is binary
-            with open(filepath, "wb") as out:
+            # The response's audio_content is binary. Write it under a temporary
+            # name and rename, so a cached path never holds a partial file
+            temp_path = filepath.with_suffix(".tmp")
+            with open(temp_path, "wb") as out:
                 # Write the response to the output file
                 out.write(response.audio_content)
+            os.replace(temp_path, filepath)
+            if filename is None:
+                self._trim_disk_cache()
             
             print(f"Audio saved to: {filepath}")
-            return filepath
+            return str(filepath)
             
         except Exception as e:
             print(f"Error converting text to speech: {e}")
             raise
     
-    def play_audio(self, filepath: str) -> None:
+    def _cache_key(self, text: str) -> str:
+        """Hash of everything that determines the synthesized audio"""
+        return hashlib.sha256(
+            f"{self.language_code}|{self.voice_gender.name}|{text}".encode("utf-8")
+        ).hexdigest()
+    
+    def _cache_path(self, text: str) -> Path:
+        """Disk cache location of the audio for text"""
+        return self.cache_dir / f"{self._cache_key(text)}.ogg"
+    
+    def _trim_disk_cache(self) -> None:
+        """Delete the least recently used cached files while the cache exceeds DISK_CACHE_BYTES"""
+        entries = []
+        for path in self.cache_dir.glob("*.ogg"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # Removed by a concurrent trim
+            entries.append((stat.st_mtime, stat.st_size, path))
+        
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        # The newest file, just written, is always kept
+        for _, size, path in entries[:-1]:
+            if total <= self.DISK_CACHE_BYTES:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            total -= size
+    
+    def _load_audio(self, text: str) -> bytes:
+        """
+        Get audio for text from memory, the disk cache, or a new synthesis
+        
+        Args:
+            text: Text to convert to speech
+            
+        Returns:
+            Ogg Opus audio content
+        """
+        key = self._cache_key(text)
+        audio_content = self._audio_memory.get(key)
+        if audio_content is not None:
+            self._audio_memory.move_to_end(key)
+            return audio_content
+        
+        audio_content = Path(self.text_to_speech(text)).read_bytes()
+        self._audio_memory[key] = audio_content
+        self._audio_memory_bytes += len(audio_content)
+        while self._audio_memory_bytes > self.MEMORY_CACHE_BYTES and len(self._audio_memory) > 1:
+            _, evicted = self._audio_memory.popitem(last=False)
+            self._audio_memory_bytes -= len(evicted)
+        return audio_content
+    
+    def play_audio(self, filepath) -> None:
         """
-        Play audio file using pygame
+        Play audio using pygame
         
         Args:
-            filepath: Path to the audio file to play
+            filepath: Path to the audio file to play, or a file-like object with
+                the audio content
         """
         try:
-            print(f"Playing audio: {filepath}")
+            print(f"Playing audio: {filepath if isinstance(filepath, (str, os.PathLike)) else 'from memory'}")
             
             # Load and play the audio file
+            if self._end_events:
+                pygame.event.clear(MUSIC_END)
             pygame.mixer.music.load(filepath)
             pygame.mixer.music.play()
             
             # Wait for playback to complete
             while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
+                if self._end_events:
+                    # Sleeps until the end event; the timeout only guards against a lost event
+                    if pygame.event.wait(1000).type == MUSIC_END:
+                        break
+                else:
+                    time.sleep(0.1)
             
             print("Audio playback completed")
             
@@ -250,23 +384,25 @@ class TTSDemo:
             print(f"Error playing audio: {e}")
             raise
     
-    def speak(self, text: str, cleanup: bool = True) -> None:
+    def speak(self, text: str, cleanup: bool = False) -> None:
         """
         Convert text to speech and play it immediately
         
         Args:
             text: Text to speak
-            cleanup: Whether to delete the temporary audio file after playing
+            cleanup: Whether to delete the audio file after playing (this also
+                drops it from the cache)
         """
         try:
-            # Convert text to speech
-            audio_file = self.text_to_speech(text)
+            # Convert text to speech; repeated phrases come straight from memory
+            audio_content = self._load_audio(text)
             
-            # Play the audio
-            self.play_audio(audio_file)
+            # Play the audio from memory, without reopening the file
+            self.play_audio(io.BytesIO(audio_content))
             
             # Clean up temporary file if requested
-            if cleanup:
+            audio_file = self._cache_path(text)
+            if cleanup and audio_file.exists():
                 try:
                     os.remove(audio_file)
                     print(f"Cleaned up temporary file: {audio_file}")
@@ -277,10 +413,98 @@ class TTSDemo:
             print(f"Error in speak method: {e}")
             raise
     
+    def speak_many(self, texts: List[str]) -> None:
+        """
+        Synthesize several phrases concurrently and play them in order
+        
+        The client's gRPC channel multiplexes the concurrent requests over one
+        HTTP/2 connection. Playback of the first phrase starts as soon as it is
+        ready, while the rest are still being synthesized.
+        
+        Args:
+            texts: Phrases to speak, in order
+        """
+        # Repeated phrases are synthesized once
+        unique_texts = list(dict.fromkeys(texts))
+        with ThreadPoolExecutor(max_workers=self.MAX_PARALLEL_SYNTHESIS) as executor:
+            futures = {text: executor.submit(self.text_to_speech, text) for text in unique_texts}
+            for text in texts:
+                # Wait for this phrase; it is on disk afterwards, so speak() finds it cached
+                futures[text].result()
+                self.speak(text)
+    
+    def speak_streaming(self, text: str, voice_name: Optional[str] = None) -> None:
+        """
+        Synthesize text with streaming synthesis and play the audio as it arrives
+        
+        Playback starts with the first chunk instead of after the whole file has
+        been synthesized and downloaded.
+        
+        Args:
+            text: Text to speak
+            voice_name: Streaming-capable voice (default: the Chirp 3 HD voice for
+                the configured language)
+        """
+        # Only needed for raw PCM output; pygame plays whole files
+        import pyaudio
+        
+        voice_name = voice_name or f"{self.language_code}-{self.STREAMING_VOICE}"
+        config_request = texttospeech.StreamingSynthesizeRequest(
+            streaming_config=texttospeech.StreamingSynthesizeConfig(
+                voice=texttospeech.VoiceSelectionParams(
+                    name=voice_name,
+                    language_code=self.language_code
+                )
+            )
+        )
+        input_request = texttospeech.StreamingSynthesizeRequest(
+            input=texttospeech.StreamingSynthesisInput(text=text)
+        )
+        
+        # Chunks are handed to a playback thread so receiving never waits on audio output
+        chunks = queue.Queue()
+        player = threading.Thread(target=self._play_pcm_chunks, args=(pyaudio, chunks), daemon=True)
+        player.start()
+        
+        try:
+            print(f"Streaming text to speech: '{text}'")
+            responses = self.client.streaming_synthesize(iter([config_request, input_request]))
+            for response in responses:
+                chunks.put(response.audio_content)
+        except Exception as e:
+            print(f"Error in streaming synthesis: {e}")
+            raise
+        finally:
+            chunks.put(None)
+            player.join()
+        
+        print("Audio playback completed")
+    
+    def _play_pcm_chunks(self, pyaudio, chunks: queue.Queue) -> None:
+        """Write raw LINEAR16 chunks to an output stream until None arrives"""
+        audio = pyaudio.PyAudio()
+        stream = audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.STREAMING_SAMPLE_RATE,
+            output=True
+        )
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    break
+                stream.write(chunk)
+        finally:
+            stream.stop_stream()
+            stream.close()
+            audio.terminate()
+    
     def cleanup(self) -> None:
         """Clean up resources"""
         try:
             pygame.mixer.quit()
+            pygame.display.quit()
             # Google Cloud Text-to-Speech client doesn't need explicit cleanup
             print("TTS Demo cleanup completed")
         except Exception as e:
@@ -1,19 +1,29 @@
-import whisper
-import warnings
+from faster_whisper import WhisperModel
+import ctranslate2
 import pyaudio
-import wave
 import threading
+import queue
 import time
 import numpy as np
-import tempfile
 import os
 
-# Suppress the FP16 warning
-warnings.filterwarnings("ignore", message="FP16 is not supported on CPU; using FP32 instead")
+# Seconds of audio the encoder sees per window (must cover record_seconds)
+CHUNK_LENGTH = 5
+# Windows waiting for the transcription thread before recording waits for it
+TRANSCRIBE_QUEUE_SIZE = 4
 
 class StreamTranscriber:
-    def __init__(self, model_name="base", language="en"):
-        self.model = whisper.load_model(model_name)
+    def __init__(self, model_name="base", language="en", silence_threshold=300):
+        # CTranslate2 runs the model with INT8 weights: FP16 activations on CUDA,
+        # INT8 on the CPU, where threads are kept to about one per physical core
+        # to leave room for the recording thread
+        on_cuda = ctranslate2.get_cuda_device_count() > 0
+        self.model = WhisperModel(
+            model_name,
+            device="cuda" if on_cuda else "cpu",
+            compute_type="int8_float16" if on_cuda else "int8",
+            cpu_threads=max(1, (os.cpu_count() or 2) // 2)
+        )
         self.audio = pyaudio.PyAudio()
         self.is_recording = False
         self.audio_frames = []
@@ -23,8 +33,19 @@ class StreamTranscriber:
         self.format = pyaudio.paInt16
         self.channels = 1
         self.rate = 16000
-        self.chunk = 2048  # Larger chunk size to reduce buffer pressure
+        self.chunk = 2048  # Frames per PyAudio callback
         self.record_seconds = 2  # Shorter chunks for more responsive transcription
+        # Chunks whose RMS level (16-bit scale) is below this are skipped as silence
+        self.silence_threshold = silence_threshold
+        # Float32 model input, reused for every window
+        self._f32 = np.empty(int(self.rate * self.record_seconds), dtype=np.float32)
+        # Captured blocks from the PyAudio callback, consumed by the recording thread
+        self.audio_blocks = queue.SimpleQueue()
+        # Full windows handed from the recording thread to the transcription thread
+        self.window_queue = queue.Queue(maxsize=TRANSCRIBE_QUEUE_SIZE)
+        # Ring of preallocated 16-bit windows: one per queue slot, plus the one
+        # being transcribed and the one being filled
+        self._windows = np.empty((TRANSCRIBE_QUEUE_SIZE + 2, len(self._f32)), dtype=np.int16)
         
     def start_streaming(self):
         """Start real-time streaming transcription"""
@@ -35,9 +56,12 @@ class StreamTranscriber:
         
         self.is_recording = True
         
-        # Start recording in a separate thread
+        # Start recording and transcription in separate threads, so a slow
+        # transcription never holds up window assembly
         recording_thread = threading.Thread(target=self._record_audio)
+        transcription_thread = threading.Thread(target=self._transcribe_windows)
         recording_thread.start()
+        transcription_thread.start()
         
         try:
             while self.is_recording:
@@ -46,68 +70,99 @@ class StreamTranscriber:
             print("\n🛑 Stopping transcription...")
             self.is_recording = False
             recording_thread.join()
+            # Let the transcription thread finish the queued windows, then stop it
+            self.window_queue.put(None)
+            transcription_thread.join()
         
         self.cleanup()
     
     def _record_audio(self):
-        """Record audio in chunks and transcribe"""
+        """Capture audio via callback and queue it in fixed-length windows"""
         stream = self.audio.open(
             format=self.format,
             channels=self.channels,
             rate=self.rate,
             input=True,
             frames_per_buffer=self.chunk,
-            stream_callback=None
+            stream_callback=self._audio_callback
         )
         
         print("🎵 Listening...")
         
+        # PyAudio keeps capturing on its own thread, so the input buffer never
+        # overflows; blocks are copied into the preallocated window ring
+        slot = 0
+        window = self._windows[slot]
+        filled = 0
         while self.is_recording:
-            frames = []
-            
-            # Record for specified duration
-            for _ in range(0, int(self.rate / self.chunk * self.record_seconds)):
-                if not self.is_recording:
-                    break
-                try:
-                    data = stream.read(self.chunk, exception_on_overflow=False)
-                    frames.append(data)
-                except OSError as e:
-                    if "Input overflowed" in str(e):
-                        # Skip this chunk if buffer overflowed
-                        continue
-                    else:
-                        raise e
+            try:
+                block = self.audio_blocks.get(timeout=0.5)
+            except queue.Empty:
+                continue
             
-            if frames:
-                # Transcribe the audio chunk
-                self._transcribe_chunk(frames)
+            while len(block):
+                count = min(len(block), len(window) - filled)
+                window[filled:filled + count] = block[:count]
+                filled += count
+                block = block[count:]
+                
+                if filled == len(window):
+                    # Hand the window to the transcription thread; when it falls
+                    # behind, this waits and new blocks collect in audio_blocks
+                    self.window_queue.put(window)
+                    slot = (slot + 1) % len(self._windows)
+                    window = self._windows[slot]
+                    filled = 0
         
         stream.stop_stream()
         stream.close()
     
-    def _transcribe_chunk(self, frames):
-        """Transcribe a chunk of audio"""
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """PyAudio callback: hand each captured block to the recording thread"""
+        self.audio_blocks.put(np.frombuffer(in_data, dtype=np.int16))
+        return (None, pyaudio.paContinue)
+    
+    def _transcribe_windows(self):
+        """Transcribe queued windows until the None sentinel arrives"""
+        while True:
+            window = self.window_queue.get()
+            if window is None:
+                break
+            self._transcribe_chunk(window)
+    
+    def _transcribe_chunk(self, pcm):
+        """Transcribe a chunk of 16-bit PCM audio"""
         try:
-            # Save audio chunk to temporary file
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                wf = wave.open(temp_file.name, 'wb')
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(self.audio.get_sample_size(self.format))
-                wf.setframerate(self.rate)
-                wf.writeframes(b''.join(frames))
-                wf.close()
-                
-                # Transcribe using Whisper with selected language
-                result = self.model.transcribe(temp_file.name, language=self.language)
-                text = result["text"].strip()
-                
-                # Clean up temporary file
-                os.unlink(temp_file.name)
-                
-                # Print transcription if there's actual content
-                if text:
-                    print(f"📝 {text}")
+            # Whisper takes 16 kHz mono float32 directly, so skip the temporary WAV
+            # file and the ffmpeg decode; cast and scale in one pass
+            audio_data = self._f32
+            np.multiply(pcm, np.float32(1.0 / 32768.0), out=audio_data)
+            
+            # Skip Whisper entirely for silent chunks; the dot product computes the
+            # sum of squares without a temporary array
+            if np.sqrt(np.dot(audio_data, audio_data) / len(audio_data)) * 32768.0 < self.silence_threshold:
+                return
+            
+            # Transcribe using Whisper with selected language; the built-in VAD also
+            # drops silent stretches inside a window that passed the gate above.
+            # The mel is padded to CHUNK_LENGTH seconds rather than Whisper's 30,
+            # so the encoder only runs over a little more than the window, and
+            # decoding is greedy with no state carried between windows
+            segments, _ = self.model.transcribe(
+                audio_data,
+                language=self.language,
+                beam_size=1,
+                vad_filter=True,
+                chunk_length=CHUNK_LENGTH,
+                condition_on_previous_text=False,
+                without_timestamps=True
+            )
+            # Segments are generated lazily, so joining them runs the decoding
+            text = "".join(segment.text for segment in segments).strip()
+            
+            # Print transcription if there's actual content
+            if text:
+                print(f"📝 {text}")
                     
         except Exception as e:
             print(f"❌ Transcription error: {e}")
@@ -6,7 +6,7 @@ Plays test_audio.wav simultaneously on two selected sound cards
 
 import pyaudio
 import wave
-import threading
+import mmap
 import time
 import sys
 import os
@@ -17,6 +17,7 @@ class DualAudioPlayer:
         self.p = pyaudio.PyAudio()
         self.streams = []
         self.audio_data = None
+        self._audio_map = None
         self.is_playing = False
         
     def list_audio_devices(self) -> List[Tuple[int, str, int]]:
@@ -42,14 +43,22 @@ class DualAudioPlayer:
             return False
             
         try:
-            with wave.open(filename, 'rb') as wf:
-                self.audio_data = {
-                    'frames': wf.readframes(wf.getnframes()),
-                    'channels': wf.getnchannels(),
-                    'sample_width': wf.getsampwidth(),
-                    'frame_rate': wf.getframerate(),
-                    'nframes': wf.getnframes()
-                }
+            with open(filename, 'rb') as f:
+                with wave.open(f) as wf:
+                    # wave stops right at the start of the sample data
+                    data_offset = f.tell()
+                    data_length = wf.getnframes() * wf.getnchannels() * wf.getsampwidth()
+                    # Map the file instead of reading it: the samples are served
+                    # from the page cache without a copy on the Python heap
+                    self._close_audio_map()
+                    self._audio_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self.audio_data = {
+                        'frames': memoryview(self._audio_map)[data_offset:data_offset + data_length],
+                        'channels': wf.getnchannels(),
+                        'sample_width': wf.getsampwidth(),
+                        'frame_rate': wf.getframerate(),
+                        'nframes': wf.getnframes()
+                    }
             print(f"✓ Loaded audio file: {filename}")
             print(f"  - Channels: {self.audio_data['channels']}")
             print(f"  - Sample Rate: {self.audio_data['frame_rate']} Hz")
@@ -60,7 +69,7 @@ class DualAudioPlayer:
             return False
     
     def create_stream(self, device_index: int, device_name: str) -> Optional[pyaudio.Stream]:
-        """Create a PyAudio stream for the specified device"""
+        """Create a stopped, callback-driven PyAudio stream for the specified device"""
         try:
             stream = self.p.open(
                 format=self.p.get_format_from_width(self.audio_data['sample_width']),
@@ -68,7 +77,9 @@ class DualAudioPlayer:
                 rate=self.audio_data['frame_rate'],
                 output=True,
                 output_device_index=device_index,
-                frames_per_buffer=1024
+                frames_per_buffer=1024,
+                stream_callback=self._make_callback(),
+                start=False
             )
             print(f"✓ Created stream for device {device_index}: {device_name}")
             return stream
@@ -76,25 +87,23 @@ class DualAudioPlayer:
             print(f"✗ Failed to create stream for device {device_index}: {e}")
             return None
     
-    def play_audio_on_stream(self, stream: pyaudio.Stream, device_name: str):
-        """Play audio on a specific stream (runs in separate thread)"""
-        try:
-            # Reset audio data position
-            audio_frames = self.audio_data['frames']
-            chunk_size = 1024 * self.audio_data['channels'] * self.audio_data['sample_width']
-            
-            print(f"🎵 Starting playback on: {device_name}")
-            
-            for i in range(0, len(audio_frames), chunk_size):
-                if not self.is_playing:
-                    break
-                chunk = audio_frames[i:i + chunk_size]
-                stream.write(chunk)
-            
-            print(f"✓ Finished playback on: {device_name}")
-            
-        except Exception as e:
-            print(f"✗ Error during playback on {device_name}: {e}")
+    def _make_callback(self):
+        """Build a PyAudio callback that feeds the loaded audio from its own position"""
+        frames = memoryview(self.audio_data['frames'])
+        bytes_per_frame = self.audio_data['channels'] * self.audio_data['sample_width']
+        position = 0
+        
+        def callback(in_data, frame_count, time_info, status):
+            nonlocal position
+            if not self.is_playing:
+                return (b"", pyaudio.paComplete)
+            # Zero-copy slice of the shared buffer; a short final slice ends the stream
+            end = position + frame_count * bytes_per_frame
+            chunk = frames[position:end]
+            position = end
+            return (chunk, pyaudio.paContinue if end < len(frames) else pyaudio.paComplete)
+        
+        return callback
     
     def play_dual_audio(self, device1_index: int, device2_index: int, device_names: Tuple[str, str]):
         """Play audio simultaneously on two devices"""
@@ -118,23 +127,15 @@ class DualAudioPlayer:
         self.streams = [stream1, stream2]
         self.is_playing = True
         
-        # Create threads for simultaneous playback
-        thread1 = threading.Thread(
-            target=self.play_audio_on_stream, 
-            args=(stream1, device_names[0])
-        )
-        thread2 = threading.Thread(
-            target=self.play_audio_on_stream, 
-            args=(stream2, device_names[1])
-        )
-        
-        # Start both threads
-        thread1.start()
-        thread2.start()
+        # PortAudio pulls audio for both devices from its own threads; starting the
+        # streams back to back keeps them in step
+        stream1.start_stream()
+        stream2.start_stream()
+        print(f"🎵 Started playback on: {device_names[0]} and {device_names[1]}")
         
-        # Wait for both threads to complete
-        thread1.join()
-        thread2.join()
+        # Wait for both streams to complete
+        while self.is_playing and (stream1.is_active() or stream2.is_active()):
+            time.sleep(0.1)
         
         print("\n✓ Dual audio playback completed!")
     
@@ -147,9 +148,23 @@ class DualAudioPlayer:
                 stream.close()
         self.streams = []
     
+    def _close_audio_map(self):
+        """Unmap the previously loaded audio file, if any"""
+        if self._audio_map is None:
+            return
+        if self.audio_data:
+            self.audio_data['frames'].release()
+        try:
+            self._audio_map.close()
+        except BufferError:
+            # A stream callback still holds a view; the map closes when it is collected
+            pass
+        self._audio_map = None
+    
     def cleanup(self):
         """Clean up resources"""
         self.stop_playback()
+        self._close_audio_map()
         self.p.terminate()
 
 def get_user_device_selection(devices: List[Tuple[int, str, int]]) -> Tuple[int, int]:
@@ -1,9 +1,31 @@
-import whisper
-import warnings
+import os
+import sys
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
 
-# Suppress the FP16 warning
-warnings.filterwarnings("ignore", message="FP16 is not supported on CPU; using FP32 instead")
+from transcribe_server import ADDRESS, read_authkey
 
-model = whisper.load_model("small")      # or "base", "medium", "turbo", etc.
-result = model.transcribe("sample.mp3")   # replace with your file
-print(result["text"])
+paths = sys.argv[1:] or ["sample.mp3"]   # replace with your file(s)
+
+try:
+    # Hand the files to the warm model in transcribe_server.py
+    with Client(ADDRESS, authkey=read_authkey()) as conn:
+        # The server resolves paths against its own working directory
+        conn.send({"paths": [os.path.abspath(path) for path in paths]})
+        reply = conn.recv()
+    if "error" in reply:
+        sys.exit(f"❌ Transcription error: {reply['error']}")
+    texts = reply["texts"]
+except (FileNotFoundError, ConnectionRefusedError, AuthenticationError):
+    # No server running (or one started by another user): load the model for
+    # this run only
+    from faster_whisper import WhisperModel
+    # CTranslate2 backend with INT8 weights; runs on CUDA when available
+    model = WhisperModel("small", device="auto", compute_type="int8")   # or "base", "medium", "turbo", etc.
+    texts = []
+    for path in paths:
+        segments, _ = model.transcribe(path)
+        texts.append("".join(segment.text for segment in segments))
+
+for text in texts:
+    print(text)
@@ -0,0 +1,69 @@
+import os
+import secrets
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener
+
+# Address shared with transcribe.py
+ADDRESS = ("localhost", 6000)
+# Per-user connection key, regenerated on every server start. Messages are
+# pickled, so only clients that can read this file may connect
+AUTHKEY_FILE = os.path.join(os.path.expanduser("~"), ".transcribe_server_key")
+
+def read_authkey():
+    """Key of the running server, readable only by the user who started it"""
+    with open(AUTHKEY_FILE, "rb") as f:
+        return f.read()
+
+def _write_authkey():
+    """Generate a fresh key and store it in a file only this user can read"""
+    authkey = secrets.token_bytes(32)
+    fd = os.open(AUTHKEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        # The mode above only applies when the file is created
+        if hasattr(os, "fchmod"):
+            os.fchmod(f.fileno(), 0o600)
+        f.write(authkey)
+    return authkey
+
+def main():
+    # Imported here so transcribe.py can share the address without loading faster-whisper
+    from faster_whisper import WhisperModel
+    
+    # Load the model once and keep it warm for every request, instead of paying
+    # the multi-second load (and GPU weight upload) on each transcribe.py run
+    print("⏳ Loading Whisper model...")
+    model = WhisperModel("small", device="auto", compute_type="int8")   # or "base", "medium", "turbo", etc.
+
+    with Listener(ADDRESS, authkey=_write_authkey()) as listener:
+        print(f"✅ Transcription server listening on {ADDRESS[0]}:{ADDRESS[1]}. Press Ctrl+C to stop.")
+        while True:
+            try:
+                conn = listener.accept()
+            except (AuthenticationError, EOFError, OSError) as e:
+                # Failed handshake, e.g. a client with the wrong key
+                print(f"⚠️ Connection rejected: {e}")
+                continue
+            with conn:
+                try:
+                    # Each message is {"paths": [...]}; the reply holds one text per path
+                    request = conn.recv()
+                    texts = []
+                    for path in request["paths"]:
+                        segments, _ = model.transcribe(path)
+                        texts.append("".join(segment.text for segment in segments))
+                    conn.send({"texts": texts})
+                except (EOFError, OSError) as e:
+                    # The client went away; keep serving the others
+                    print(f"⚠️ Client disconnected: {e}")
+                except Exception as e:
+                    print(f"❌ Transcription error: {e}")
+                    try:
+                        conn.send({"error": str(e)})
+                    except (EOFError, OSError):
+                        pass
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n🛑 Transcription server stopped.")